@@ -0,0 +1,81 @@
+from math import pi
+
+import numpy as np
+
+from main import Rect, Circle, Triangle
+
+
+class ShapeBatch:
+    """Набор фигур, хранящийся по столбцам: прямоугольники (a, b),
+    круги (r) и треугольники (a, b, c). Периметры и площади считаются
+    для всего набора сразу, без обхода объектов."""
+
+    def __init__(self, rects=None, circles=None, triangles=None):
+        rects = np.asarray(rects if rects is not None else np.empty((0, 2)), dtype=np.float64).reshape(-1, 2)
+        circles = np.asarray(circles if circles is not None else np.empty(0), dtype=np.float64).reshape(-1)
+        triangles = np.asarray(triangles if triangles is not None else np.empty((0, 3)),
+                               dtype=np.float64).reshape(-1, 3)
+
+        self.rect_a, self.rect_b = rects[:, 0], rects[:, 1]
+        self.circle_r = circles
+        self.tri_a, self.tri_b, self.tri_c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+
+    @classmethod
+    def from_shapes(cls, shapes):
+        rects, circles, triangles = [], [], []
+        for shape in shapes:
+            if isinstance(shape, Rect):
+                rects.append((shape.a, shape.b))
+            elif isinstance(shape, Circle):
+                circles.append(shape.r)
+            elif isinstance(shape, Triangle):
+                triangles.append((shape.a, shape.b, shape.c))
+            else:
+                raise TypeError(f"Неизвестная фигура: {shape!r}")
+        return cls(rects, circles, triangles)
+
+    def __len__(self):
+        return len(self.rect_a) + len(self.circle_r) + len(self.tri_a)
+
+    # Проверки те же, что и в конструкторах Rect/Circle/Triangle,
+    # только вместо исключения получаем маску корректных фигур.
+    @property
+    def rect_valid(self):
+        return (self.rect_a > 0) & (self.rect_b > 0)
+
+    @property
+    def circle_valid(self):
+        return self.circle_r > 0
+
+    @property
+    def triangle_valid(self):
+        return (self.tri_a > 0) & (self.tri_b > 0) & (self.tri_c > 0)
+
+    def perimeters(self):
+        """Периметры по видам фигур; для некорректных фигур - nan."""
+        rect = np.where(self.rect_valid, (self.rect_a + self.rect_b) * 2, np.nan)
+        circle = np.where(self.circle_valid, 2 * pi * self.circle_r, np.nan)
+        triangle = np.where(self.triangle_valid, self.tri_a + self.tri_b + self.tri_c, np.nan)
+        return {"rect": rect, "circle": circle, "triangle": triangle}
+
+    def areas(self):
+        """Площади по видам фигур; для некорректных фигур - nan."""
+        rect = np.where(self.rect_valid, self.rect_a * self.rect_b, np.nan)
+        circle = np.where(self.circle_valid, pi * self.circle_r ** 2, np.nan)
+
+        a, b, c = self.tri_a, self.tri_b, self.tri_c
+        p = (a + b + c) / 2
+        # Для невозможных треугольников подкоренное выражение отрицательно.
+        heron = np.clip(p * (p - a) * (p - b) * (p - c), 0, None)
+        triangle = np.where(self.triangle_valid, np.sqrt(heron), np.nan)
+        return {"rect": rect, "circle": circle, "triangle": triangle}
+
+
+if __name__ == "__main__":
+    batch = ShapeBatch.from_shapes([Rect(1, 2), Circle(5), Triangle(3, 4, 5)])
+    print(batch.perimeters())
+    print(batch.areas())
+
+    batch = ShapeBatch(rects=[(1, 2), (-1, 3)], circles=[5, 0], triangles=[(2, 2, 4), (3, 4, 5)])
+    print(batch.rect_valid, batch.circle_valid, batch.triangle_valid)
+    print(batch.areas())
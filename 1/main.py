@@ -1,7 +1,21 @@
 from math import pi
 
 
+def fmt(value):
+    return f"{value:.1f}"
+
+
 class Share:
+    # Периметр и площадь кешируются и сбрасываются при изменении размеров.
+    __slots__ = ("_perimeter", "_area")
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._perimeter = None
+        self._area = None
+
     def perimeter(self):
         raise AssertionError
 
@@ -10,72 +24,103 @@ class Share:
 
     @property
     def get_perimetr(self):
-        return self.perimeter()
+        if self._perimeter is None:
+            self._perimeter = float(self.perimeter())
+        return self._perimeter
 
     @property
     def get_square(self):
-        return self.area()
+        if self._area is None:
+            self._area = float(self.area())
+        return self._area
+
+
+def _side(name, error=AssertionError):
+    attr = "_" + name
+
+    def getter(self):
+        return getattr(self, attr)
+
+    def setter(self, value):
+        if value <= 0:
+            raise error
+        setattr(self, attr, value)
+        self._reset()
+
+    return property(getter, setter)
 
 
 class Rect(Share):
+    __slots__ = ("_a", "_b")
+
+    a = _side("a", ValueError)
+    b = _side("b", ValueError)
+
     def __init__(self, a: int, b: int):
-        if a <= 0 or b <= 0:
-            raise ValueError
+        super().__init__()
         self.a, self.b = a, b
 
     def __str__(self):
         return f"Прямоугольник {self.a}x{self.b}"
 
     def perimeter(self):
-        return f"{(self.a + self.b) * 2:.1f}"
+        return (self.a + self.b) * 2
 
     def area(self):
-        return f"{self.a * self.b:.1f}"
+        return self.a * self.b
 
 
 class Circle(Share):
+    __slots__ = ("_r",)
+
+    r = _side("r")
+
     def __init__(self, r: float):
-        if r <= 0:
-            raise AssertionError
+        super().__init__()
         self.r = r
 
     def __str__(self):
         return f"Круг радиусом {self.r:.1f}"
 
     def perimeter(self):
-        return f"{2 * self.r * pi:.1f}"
+        return 2 * self.r * pi
 
     def area(self):
-        return f"{self.r ** 2 * pi:.1f}"
+        return self.r ** 2 * pi
 
 
 class Triangle(Share):
+    __slots__ = ("_a", "_b", "_c")
+
+    a = _side("a")
+    b = _side("b")
+    c = _side("c")
+
     def __init__(self, a: float, b: float, c: float):
-        if a <= 0 or b <= 0 or c <= 0:
-            raise AssertionError
+        super().__init__()
         self.a, self.b, self.c = a, b, c
 
     def __str__(self):
         return f"Треугольник с {self.a}x{self.b}x{self.c}"
 
     def perimeter(self):
-        return f"{self.a + self.b + self.c:.1f}"
+        return self.a + self.b + self.c
 
     def area(self):
-        p = self.a * self.b * self.c / 2
-        return f"{(p * (p - self.a) * (p - self.b) * (p - self.c)) ** 0.5:.1f}"
+        p = (self.a + self.b + self.c) / 2
+        return max(p * (p - self.a) * (p - self.b) * (p - self.c), 0) ** 0.5
 
 
 if __name__ == "__main__":
     r = Rect(1, 2)
-    print(r.get_perimetr)
-    print(r.get_square)
+    print(fmt(r.get_perimetr))
+    print(fmt(r.get_square))
     s = Circle(5)
     print(s)
-    print(s.get_perimetr)
-    print(s.get_square)
+    print(fmt(s.get_perimetr))
+    print(fmt(s.get_square))
     t = Triangle(2, 2, 4)
     print(t)
-    print(t.get_perimetr)
-    print(t.get_square)
+    print(fmt(t.get_perimetr))
+    print(fmt(t.get_square))
     s = Share()
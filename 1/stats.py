@@ -0,0 +1,245 @@
+"""Потоковая статистика по файлу фигур.
+
+Поддерживаются два формата:
+  * CSV: строки ``вид,a,b,c``, где вид - rect, circle или triangle;
+    лишние размеры оставляются пустыми (``circle,5,,``);
+  * двоичный: подряд идущие записи RECORD (байт вида и три float64).
+
+Файл читается кусками по --chunk записей, поэтому память не зависит от
+размера входа. С --workers куски обрабатываются в пуле процессов; для
+CSV там же идёт и разбор строк, а главный процесс только режет файл на
+куски. Неизвестный вид фигуры или не число в размере останавливают
+подсчёт с номером строки (записи); неположительные размеры считаются
+некорректными фигурами.
+
+    python stats.py shapes.csv
+    python stats.py shapes.bin --binary --workers 4
+"""
+import argparse
+import csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from batch import ShapeBatch
+
+KINDS = ("rect", "circle", "triangle")
+RECORD = np.dtype([("kind", "u1"), ("a", "<f8"), ("b", "<f8"), ("c", "<f8")])
+
+
+def read_binary(path, chunk):
+    """Куски записей RECORD. Неизвестный вид - ValueError с номером
+    записи (с единицы), как номер строки у CSV."""
+    first = 1
+    with open(path, "rb") as f:
+        while True:
+            records = np.fromfile(f, dtype=RECORD, count=chunk)
+            if not len(records):
+                return
+            bad = np.flatnonzero(records["kind"] >= len(KINDS))
+            if len(bad):
+                raise ValueError(f"{path}: запись {first + bad[0]}: неизвестный вид фигуры "
+                                 f"{records['kind'][bad[0]]}")
+            first += len(records)
+            yield records
+
+
+def read_csv_lines(path, chunk):
+    """Сырые куски CSV: пары (номер первой строки, список строк). Разбор
+    отложен до parse_csv, чтобы с --workers он шёл в процессах пула."""
+    lines = []
+    first = 1
+    with open(path, newline="") as f:
+        for number, line in enumerate(f, 1):
+            if not lines:
+                first = number
+            lines.append(line)
+            if len(lines) == chunk:
+                yield first, lines
+                lines = []
+    if lines:
+        yield first, lines
+
+
+def parse_csv(part, path="<csv>"):
+    """Записи RECORD из куска read_csv_lines. Неизвестный вид или не число
+    в размере - ValueError с номером строки."""
+    first, lines = part
+    records = np.empty(len(lines), dtype=RECORD)
+    n = 0
+    reader = csv.reader(lines)
+    for row in reader:
+        if not row or row[0].startswith("#"):
+            continue
+        line = first + reader.line_num - 1
+        kind = row[0].strip().lower()
+        if kind not in KINDS:
+            raise ValueError(f"{path}:{line}: неизвестный вид фигуры {row[0]!r}")
+        try:
+            sizes = [float(x) if x.strip() else 0.0 for x in row[1:4]]
+        except ValueError:
+            raise ValueError(f"{path}:{line}: размер не число: {','.join(row)!r}") from None
+        sizes += [0.0] * (3 - len(sizes))
+        records[n] = (KINDS.index(kind), *sizes)
+        n += 1
+    return records[:n]
+
+
+def read_csv(path, chunk):
+    for part in read_csv_lines(path, chunk):
+        yield parse_csv(part, path)
+
+
+def write_binary(path, kinds, sizes):
+    """Записывает фигуры в двоичный формат; sizes - массив (n, 3)."""
+    records = np.empty(len(kinds), dtype=RECORD)
+    records["kind"] = kinds
+    records["a"], records["b"], records["c"] = np.asarray(sizes, dtype=np.float64).T
+    with open(path, "ab") as f:
+        records.tofile(f)
+
+
+class Summary:
+    """Накопленные сумма, минимум, максимум и гистограмма одной величины."""
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.hist = np.zeros(len(edges) - 1, dtype=np.int64)
+
+    def add(self, values):
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        # Хвосты за пределами диапазона попадают в крайние столбцы.
+        clipped = np.clip(values, self.edges[0], self.edges[-1])
+        self.hist += np.histogram(clipped, bins=self.edges)[0]
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.hist += other.hist
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float("nan")
+
+
+class KindStats:
+    def __init__(self, area_edges, perimeter_edges):
+        self.invalid = 0
+        self.area = Summary(area_edges)
+        self.perimeter = Summary(perimeter_edges)
+
+    def merge(self, other):
+        self.invalid += other.invalid
+        self.area.merge(other.area)
+        self.perimeter.merge(other.perimeter)
+
+
+def chunk_stats(records, area_edges, perimeter_edges):
+    result = {}
+    for code, kind in enumerate(KINDS):
+        part = records[records["kind"] == code]
+        if kind == "rect":
+            batch = ShapeBatch(rects=np.column_stack((part["a"], part["b"])))
+        elif kind == "circle":
+            batch = ShapeBatch(circles=part["a"])
+        else:
+            batch = ShapeBatch(triangles=np.column_stack((part["a"], part["b"], part["c"])))
+
+        area, perimeter = batch.areas()[kind], batch.perimeters()[kind]
+        valid = ~np.isnan(area)
+        stats = KindStats(area_edges, perimeter_edges)
+        stats.invalid = int((~valid).sum())
+        stats.area.add(area[valid])
+        stats.perimeter.add(perimeter[valid])
+        result[kind] = stats
+    return result
+
+
+def parsed_chunk_stats(parse, part, area_edges, perimeter_edges):
+    return chunk_stats(parse(part), area_edges, perimeter_edges)
+
+
+def collect(chunks, area_edges, perimeter_edges, workers=0, parse=None):
+    """parse, если задан, превращает кусок в записи RECORD; с workers он
+    выполняется в процессах пула вместе с подсчётом."""
+    totals = {kind: KindStats(area_edges, perimeter_edges) for kind in KINDS}
+
+    def merge(part):
+        for kind, stats in part.items():
+            totals[kind].merge(stats)
+
+    if parse is None:
+        task, extra = chunk_stats, ()
+    else:
+        task, extra = parsed_chunk_stats, (parse,)
+
+    if workers <= 1:
+        for records in chunks:
+            merge(task(*extra, records, area_edges, perimeter_edges))
+        return totals
+
+    # В обработке держим не больше 2 * workers кусков, иначе быстрое
+    # чтение файла опередит пул и всё окажется в памяти.
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for records in chunks:
+            pending.append(pool.submit(task, *extra, records, area_edges, perimeter_edges))
+            if len(pending) >= 2 * workers:
+                merge(pending.popleft().result())
+        while pending:
+            merge(pending.popleft().result())
+    return totals
+
+
+def print_summary(name, summary):
+    print(f"  {name}: n={summary.count} sum={summary.total:.1f} mean={summary.mean:.1f} "
+          f"min={summary.min:.1f} max={summary.max:.1f}")
+    for lo, hi, n in zip(summary.edges[:-1], summary.edges[1:], summary.hist):
+        if n:
+            print(f"    [{lo:10.1f}, {hi:10.1f}) {n}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Статистика площадей и периметров фигур из файла")
+    parser.add_argument("path")
+    parser.add_argument("--binary", action="store_true", help="двоичный формат вместо CSV")
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="записей в одном куске")
+    parser.add_argument("--workers", type=int, default=0, help="число процессов")
+    parser.add_argument("--bins", type=int, default=10)
+    parser.add_argument("--max-area", type=float, default=1000.0)
+    parser.add_argument("--max-perimeter", type=float, default=200.0)
+    args = parser.parse_args(argv)
+
+    area_edges = np.linspace(0, args.max_area, args.bins + 1)
+    perimeter_edges = np.linspace(0, args.max_perimeter, args.bins + 1)
+    if args.binary:
+        chunks, parse = read_binary(args.path, args.chunk), None
+    else:
+        chunks, parse = read_csv_lines(args.path, args.chunk), partial(parse_csv, path=args.path)
+    try:
+        totals = collect(chunks, area_edges, perimeter_edges, args.workers, parse)
+    except ValueError as e:
+        parser.exit(1, f"ошибка: {e}\n")
+
+    for kind in KINDS:
+        stats = totals[kind]
+        print(f"{kind}: некорректных {stats.invalid}")
+        print_summary("площадь", stats.area)
+        print_summary("периметр", stats.perimeter)
+
+
+if __name__ == "__main__":
+    main()
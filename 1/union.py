@@ -0,0 +1,252 @@
+"""Площадь и периметр объединения пересекающихся фигур.
+
+Фигуры задаются с положением: ``(x, y, Rect)`` - левый нижний угол
+прямоугольника, ``(x, y, Circle)`` - центр круга.
+
+Только прямоугольники: сканирующая прямая по x и дерево отрезков по
+сжатым координатам y, O(n log n), результат точный.
+
+Есть круги: граница объединения собирается из открытых частей -
+дуг окружностей и кусков сторон прямоугольников, из которых вычтено
+всё, что лежит внутри других фигур, O(n^2 log n). Периметр - сумма их
+длин, площадь - по формуле Грина, как половина интеграла x dy - y dx
+вдоль границы; у дуги и отрезка он берётся в замкнутом виде, так что
+обе величины точные.
+"""
+from bisect import bisect_left
+from math import pi, sqrt, acos, atan2, cos, sin, hypot
+
+from main import Rect, Circle
+
+
+def _split(shapes):
+    rects, circles = [], []
+    for x, y, shape in shapes:
+        if isinstance(shape, Rect):
+            rects.append((x, y, x + shape.a, y + shape.b))
+        elif isinstance(shape, Circle):
+            circles.append((x, y, shape.r))
+        else:
+            raise TypeError(f"Объединение не поддерживает фигуру {shape!r}")
+    # Совпадающие фигуры закрывали бы друг друга целиком.
+    return list(dict.fromkeys(rects)), list(dict.fromkeys(circles))
+
+
+class _SegmentTree:
+    """Дерево отрезков над сжатыми координатами: сколько раз покрыт
+    каждый узел и какая длина покрыта хотя бы раз."""
+
+    def __init__(self, coords):
+        self.coords = coords
+        size = 1
+        while size < len(coords):
+            size *= 2
+        self.cover = [0] * (2 * size)
+        self.length = [0.0] * (2 * size)
+
+    def update(self, lo, hi, delta, node=1, left=0, right=None):
+        if right is None:
+            right = len(self.coords) - 1
+        if hi <= left or right <= lo:
+            return
+        if lo <= left and right <= hi:
+            self.cover[node] += delta
+        else:
+            mid = (left + right) // 2
+            self.update(lo, hi, delta, 2 * node, left, mid)
+            self.update(lo, hi, delta, 2 * node + 1, mid, right)
+
+        if self.cover[node]:
+            self.length[node] = self.coords[right] - self.coords[left]
+        elif right - left == 1:
+            self.length[node] = 0.0
+        else:
+            self.length[node] = self.length[2 * node] + self.length[2 * node + 1]
+
+    @property
+    def covered(self):
+        return self.length[1]
+
+
+def _sweep(rects):
+    """Площадь и суммарная длина вертикальных границ объединения."""
+    ys = sorted({y for r in rects for y in (r[1], r[3])})
+    events = []
+    for x0, y0, x1, y1 in rects:
+        events.append((x0, -1, y0, y1))
+        events.append((x1, 1, y0, y1))
+    # При равных x сначала добавления: соприкасающиеся стороны не граница.
+    events.sort()
+
+    tree = _SegmentTree(ys)
+    area = boundary = 0.0
+    prev_x = events[0][0]
+    for x, kind, y0, y1 in events:
+        area += tree.covered * (x - prev_x)
+        before = tree.covered
+        tree.update(bisect_left(ys, y0), bisect_left(ys, y1), -kind)
+        boundary += abs(tree.covered - before)
+        prev_x = x
+    return area, boundary
+
+
+def rect_union(rects):
+    if not rects:
+        return 0.0, 0.0
+    area, vertical = _sweep(rects)
+    _, horizontal = _sweep([(y0, x0, y1, x1) for x0, y0, x1, y1 in rects])
+    return area, vertical + horizontal
+
+
+def _merged(intervals):
+    """Объединение отрезков: отсортированный список непересекающихся."""
+    result = []
+    for lo, hi in sorted(intervals):
+        if hi <= lo:
+            continue
+        if result and lo <= result[-1][1]:
+            if hi > result[-1][1]:
+                result[-1] = (result[-1][0], hi)
+        else:
+            result.append((lo, hi))
+    return result
+
+
+def _complement(covered, lo, hi):
+    """Части [lo, hi], не покрытые отрезками covered."""
+    free = []
+    for a, b in _merged(covered):
+        if a > lo:
+            free.append((lo, min(a, hi)))
+        lo = max(lo, b)
+    if lo < hi:
+        free.append((lo, hi))
+    return [(a, b) for a, b in free if b > a]
+
+
+def _in_rect_arcs(cx, cy, r, rect):
+    """Угловые отрезки окружности, лежащие внутри прямоугольника."""
+    x0, y0, x1, y1 = rect
+    angles = [0.0, 2 * pi]
+    for value, center, trig in ((x0, cx, cos), (x1, cx, cos), (y0, cy, sin), (y1, cy, sin)):
+        t = (value - center) / r
+        # Касание тоже делит окружность: иначе середина дуги может попасть
+        # ровно в точку касания на стороне.
+        if -1 <= t <= 1:
+            base = acos(t) if trig is cos else atan2(t, sqrt(1 - t * t))
+            other = -base if trig is cos else pi - base
+            angles.extend(v % (2 * pi) for v in (base, other))
+    angles.sort()
+    arcs = []
+    for lo, hi in zip(angles, angles[1:]):
+        mid = (lo + hi) / 2
+        px, py = cx + r * cos(mid), cy + r * sin(mid)
+        if hi > lo and x0 < px < x1 and y0 < py < y1:
+            arcs.append((lo, hi))
+    return arcs
+
+
+def _circle_exposed(i, circles, rects):
+    """Угловые отрезки окружности i на границе объединения."""
+    cx, cy, r = circles[i]
+    covered = []
+    for j, (cx2, cy2, r2) in enumerate(circles):
+        if j == i:
+            continue
+        d = hypot(cx2 - cx, cy2 - cy)
+        if d >= r + r2 or d + r2 <= r:
+            continue
+        if d + r <= r2:
+            return []
+        phi = atan2(cy2 - cy, cx2 - cx)
+        alpha = acos((r * r + d * d - r2 * r2) / (2 * r * d))
+        lo, hi = (phi - alpha) % (2 * pi), (phi + alpha) % (2 * pi)
+        if lo <= hi:
+            covered.append((lo, hi))
+        else:
+            covered.extend([(lo, 2 * pi), (0.0, hi)])
+    for rect in rects:
+        covered.extend(_in_rect_arcs(cx, cy, r, rect))
+    return _complement(covered, 0.0, 2 * pi)
+
+
+def _rect_exposed(i, rects, circles):
+    """Части сторон прямоугольника i на границе объединения - отрезки
+    ((x, y), (x, y)) в обходе против часовой стрелки."""
+    x0, y0, x1, y1 = rects[i]
+    pieces = []
+    # (постоянная координата, начало, конец, горизонтальная ли, фигура снаружи со стороны sign)
+    edges = ((y0, x0, x1, True, -1), (y1, x0, x1, True, 1),
+             (x0, y0, y1, False, -1), (x1, y0, y1, False, 1))
+    for fixed, lo, hi, horizontal, side in edges:
+        covered = []
+        for j, other in enumerate(rects):
+            if j == i:
+                continue
+            ox0, oy0, ox1, oy1 = other if horizontal else (other[1], other[0], other[3], other[2])
+            near, far = (oy0, oy1)
+            inside = near < fixed < far
+            # Общая сторона: внутренняя, если прямоугольники по разные
+            # стороны от неё, и считается один раз, если по одну.
+            touching = fixed == (near if side == 1 else far)
+            duplicate = fixed == (far if side == 1 else near) and j < i
+            if inside or touching or duplicate:
+                covered.append((max(lo, ox0), min(hi, ox1)))
+        for cx, cy, r in circles:
+            c_along, c_across = (cx, cy) if horizontal else (cy, cx)
+            off = fixed - c_across
+            if abs(off) < r:
+                h = sqrt(r * r - off * off)
+                covered.append((max(lo, c_along - h), min(hi, c_along + h)))
+        for a, b in _complement(covered, lo, hi):
+            # Нижняя сторона и правая идут по возрастанию, верхняя и левая - назад.
+            if side == 1 and horizontal or side == -1 and not horizontal:
+                a, b = b, a
+            pieces.append(((a, fixed), (b, fixed)) if horizontal else ((fixed, a), (fixed, b)))
+    return pieces
+
+
+def _boundary(rects, circles):
+    """Дуги (cx, cy, r, от, до) и отрезки ((x, y), (x, y)) границы
+    объединения; внутренность всюду слева."""
+    arcs = [(*circles[i], lo, hi)
+            for i in range(len(circles)) for lo, hi in _circle_exposed(i, circles, rects)]
+    segments = [piece for i in range(len(rects)) for piece in _rect_exposed(i, rects, circles)]
+    return arcs, segments
+
+
+def _green_area(rects, circles):
+    # Начало координат в первом центре: меньше сокращения больших чисел.
+    ox, oy = circles[0][:2]
+    arcs, segments = _boundary([(x0 - ox, y0 - oy, x1 - ox, y1 - oy) for x0, y0, x1, y1 in rects],
+                               [(cx - ox, cy - oy, r) for cx, cy, r in circles])
+    # Формула Грина: площадь = 1/2 * контурный интеграл (x dy - y dx).
+    twice = sum(r * r * (hi - lo) + cx * r * (sin(hi) - sin(lo)) - cy * r * (cos(hi) - cos(lo))
+                for cx, cy, r, lo, hi in arcs)
+    twice += sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in segments)
+    return twice / 2
+
+
+def union_area(shapes):
+    rects, circles = _split(shapes)
+    if not circles:
+        return _sweep(rects)[0] if rects else 0.0
+    return _green_area(rects, circles)
+
+
+def union_perimeter(shapes):
+    rects, circles = _split(shapes)
+    if not circles:
+        return rect_union(rects)[1]
+    arcs, segments = _boundary(rects, circles)
+    return (sum(r * (hi - lo) for _, _, r, lo, hi in arcs)
+            + sum(hypot(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in segments))
+
+
+if __name__ == "__main__":
+    shapes = [(0, 0, Rect(2, 2)), (1, 1, Rect(2, 2))]
+    print(union_area(shapes), union_perimeter(shapes))
+    shapes = [(0, 0, Circle(1)), (1, 0, Circle(1))]
+    print(union_area(shapes), union_perimeter(shapes))
+    shapes = [(0, 0, Rect(2, 2)), (2, 1, Circle(1))]
+    print(union_area(shapes), union_perimeter(shapes))
@@ -1,2 +1,9 @@
 from .master import *
-from .xor import *
\ No newline at end of file
+from .xor import *
+from .compiler import *
+from .bitsim import *
+from .netlist import *
+from .store import *
+from .faults import *
+from .optimize import *
+from .sequential import *
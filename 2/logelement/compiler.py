@@ -0,0 +1,165 @@
+from collections import deque
+from functools import cached_property
+
+from .master import TNot, TAnd, TOr
+from .xor import TXor, TXorV2
+
+OPS = {TNot: "not", TAnd: "and", TOr: "or", TXor: "xor", TXorV2: "xor"}
+ARITY = {"not": 1, "and": 2, "or": 2, "xor": 2}
+SYMBOLS = {"and": "&", "or": "|", "xor": "^"}
+
+
+def gate_op(el):
+    for cls in type(el).__mro__:
+        if cls in OPS:
+            return OPS[cls]
+    raise TypeError(f"Неизвестный элемент: {type(el).__name__}")
+
+
+def collect(elements):
+    """Все элементы, достижимые из elements по связям link()."""
+    seen = {}
+    queue = deque(elements)
+    while queue:
+        el = queue.popleft()
+        if id(el) in seen:
+            continue
+        seen[id(el)] = el
+        for nextEl, _ in el.Links:
+            queue.append(nextEl)
+    return list(seen.values())
+
+
+class Circuit:
+    """Схема, скомпилированная в плоский список команд.
+
+    Ячейки 0..len(inputs)-1 - входы схемы, дальше по ячейке на каждый
+    элемент в топологическом порядке. Команда ``(op, a, b)`` пишет в свою
+    ячейку результат операции над ячейками a и b (у "not" b = -1).
+
+    С expand составной TXor разворачивается в свои четыре элемента, и у
+    каждого из них появляется своя ячейка (это нужно, например, для
+    моделирования неисправностей внутри TXor). labels[i] - имя i-й команды.
+    """
+
+    def __init__(self, elements, inputs=None, outputs=None, expand=False):
+        elements = collect(elements)
+        driver = {}
+        for el in elements:
+            for nextEl, nextIn in el.Links:
+                driver[id(nextEl), nextIn] = el
+
+        # Входы: явно заданные группы выводов плюс все свободные выводы.
+        self.inputs = [list(group) for group in inputs or []]
+        bound = {(id(el), pin): i for i, group in enumerate(self.inputs) for el, pin in group}
+        for el in elements:
+            for pin in range(1, ARITY[gate_op(el)] + 1):
+                if (id(el), pin) not in driver and (id(el), pin) not in bound:
+                    bound[id(el), pin] = len(self.inputs)
+                    self.inputs.append([(el, pin)])
+
+        order = self._toposort(elements, driver)
+        self.slots = {}
+        self.instructions = []
+        self.labels = []
+        self.elements = order
+        for number, el in enumerate(order):
+            op = gate_op(el)
+            args = []
+            for pin in range(1, ARITY[op] + 1):
+                if (id(el), pin) in driver:
+                    args.append(self.slots[id(driver[id(el), pin])])
+                else:
+                    args.append(bound[id(el), pin])
+            label = f"{type(el).__name__}{number}"
+            if expand and isinstance(el, TXor):
+                a, b = args
+                or_ = self._emit("or", a, b, label + "._or")
+                and_ = self._emit("and", a, b, label + "._and")
+                not_and = self._emit("not", and_, -1, label + "._notAnd")
+                self.slots[id(el)] = self._emit("and", or_, not_and, label + "._finalAnd")
+            else:
+                self.slots[id(el)] = self._emit(op, args[0], args[1] if len(args) > 1 else -1, label)
+
+        if outputs is None:
+            outputs = [el for el in order if not el.Links]
+        self.outputs = list(outputs)
+        self.output_slots = [self.slots[id(el)] for el in self.outputs]
+
+    def _emit(self, op, a, b, label):
+        self.instructions.append((op, a, b))
+        self.labels.append(label)
+        return len(self.inputs) + len(self.instructions) - 1
+
+    @staticmethod
+    def _toposort(elements, driver):
+        indegree = {id(el): 0 for el in elements}
+        for (el_id, _), _ in driver.items():
+            indegree[el_id] += 1
+        queue = deque(el for el in elements if not indegree[id(el)])
+        order = []
+        while queue:
+            el = queue.popleft()
+            order.append(el)
+            for nextEl, _ in el.Links:
+                indegree[id(nextEl)] -= 1
+                if not indegree[id(nextEl)]:
+                    queue.append(nextEl)
+        if len(order) != len(elements):
+            raise ValueError("Схема содержит цикл")
+        return order
+
+    # Текст и функция строятся при первом вызове: анализу схемы
+    # (неисправности, оптимизация) хватает списка команд.
+    @cached_property
+    def source(self):
+        return self.generate()
+
+    @cached_property
+    def function(self):
+        namespace = {}
+        exec(compile(self.source, "<circuit>", "exec"), namespace)
+        return namespace["circuit"]
+
+    @property
+    def n_slots(self):
+        return len(self.inputs) + len(self.instructions)
+
+    def generate(self, name="circuit", bitwise=False):
+        """Исходный текст функции, вычисляющей схему за один проход.
+        С bitwise функция принимает последним аргументом маску, отрицание
+        делается через ^ mask, и за вызов считается пачка наборов,
+        упакованных в биты целых чисел."""
+        args = [f"s{i}" for i in range(len(self.inputs))] + (["mask"] if bitwise else [])
+        lines = [f"def {name}({', '.join(args)}):"]
+        first = len(self.inputs)
+        for i, (op, a, b) in enumerate(self.instructions):
+            if op == "not":
+                expr = f"s{a} ^ mask" if bitwise else f"not s{a}"
+            else:
+                expr = f"s{a} {SYMBOLS[op]} s{b}"
+            lines.append(f"    s{first + i} = {expr}")
+        lines.append(f"    return ({''.join(f's{i}, ' for i in self.output_slots)})")
+        return "\n".join(lines) + "\n"
+
+    def run(self, values):
+        """Тот же расчёт по списку команд, без генерации кода."""
+        slots = list(values) + [False] * len(self.instructions)
+        first = len(self.inputs)
+        for i, (op, a, b) in enumerate(self.instructions):
+            if op == "not":
+                slots[first + i] = not slots[a]
+            elif op == "and":
+                slots[first + i] = slots[a] and slots[b]
+            elif op == "or":
+                slots[first + i] = slots[a] or slots[b]
+            else:
+                slots[first + i] = slots[a] != slots[b]
+        return tuple(slots[i] for i in self.output_slots)
+
+    def __call__(self, *values):
+        return self.function(*values)
+
+
+def compile_circuit(elements, inputs=None, outputs=None, expand=False):
+    return Circuit(elements, inputs, outputs, expand)
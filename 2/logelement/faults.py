@@ -0,0 +1,126 @@
+"""Моделирование константных неисправностей (stuck-at-0/1).
+
+Неисправность - выход одного элемента, залипший в 0 или 1. Схема
+компилируется с развёрнутыми TXor, поэтому неисправности перебираются и
+для элементов внутри составных TXor.
+
+Много неисправных копий схемы считаются одновременно: в k-м бите
+каждой ячейки лежит значение k-й копии, нулевой бит - исправная схема.
+Залипание задаётся масками: после вычисления ячейки её биты, принадлежащие
+неисправным копиям, принудительно сбрасываются или устанавливаются.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+
+class Fault:
+    __slots__ = ("slot", "value", "label")
+
+    def __init__(self, slot, value, label):
+        self.slot = slot
+        self.value = value
+        self.label = label
+
+    def __repr__(self):
+        return f"{self.label} stuck-at-{self.value}"
+
+
+def enumerate_faults(circuit):
+    first = len(circuit.inputs)
+    return [Fault(first + i, value, label)
+            for i, label in enumerate(circuit.labels) for value in (0, 1)]
+
+
+def _detect(instructions, n_inputs, output_slots, faults, tests):
+    """Какие из faults (пары ячейка, значение) обнаруживает набор тестов."""
+    lanes = len(faults) + 1
+    mask = (1 << lanes) - 1
+    keep = {}
+    force = {}
+    for lane, (slot, value) in enumerate(faults, 1):
+        keep[slot] = keep.get(slot, mask) & ~(1 << lane)
+        if value:
+            force[slot] = force.get(slot, 0) | (1 << lane)
+
+    detected = 0
+    pending = mask & ~1
+    slots = [0] * (n_inputs + len(instructions))
+    for test in tests:
+        for i, bit in enumerate(test):
+            slots[i] = mask if bit else 0
+        slot = n_inputs
+        for op, a, b in instructions:
+            if op == "not":
+                value = slots[a] ^ mask
+            elif op == "and":
+                value = slots[a] & slots[b]
+            elif op == "or":
+                value = slots[a] | slots[b]
+            else:
+                value = slots[a] ^ slots[b]
+            if slot in keep:
+                value = (value & keep[slot]) | force.get(slot, 0)
+            slots[slot] = value
+            slot += 1
+        for out in output_slots:
+            good = mask if slots[out] & 1 else 0
+            detected |= slots[out] ^ good
+        if not pending & ~detected:
+            break
+    return [bool(detected >> lane & 1) for lane in range(1, lanes)]
+
+
+# Схема и тесты в процессе-исполнителе: передаются один раз при его
+# запуске, а не с каждой группой неисправностей.
+_shared = None
+
+
+def _share(instructions, n_inputs, output_slots, tests):
+    global _shared
+    _shared = instructions, n_inputs, output_slots, tests
+
+
+def _detect_shared(faults):
+    instructions, n_inputs, output_slots, tests = _shared
+    return _detect(instructions, n_inputs, output_slots, faults, tests)
+
+
+class FaultReport:
+    def __init__(self, detected, undetected):
+        self.detected = detected
+        self.undetected = undetected
+
+    @property
+    def total(self):
+        return len(self.detected) + len(self.undetected)
+
+    @property
+    def coverage(self):
+        return len(self.detected) / self.total if self.total else 1.0
+
+    def __str__(self):
+        return f"Покрытие {self.coverage:.1%}: обнаружено {len(self.detected)} из {self.total}"
+
+
+def fault_coverage(circuit, tests, faults=None, lanes=256, workers=0):
+    """Покрытие неисправностей набором тестов (последовательностей 0/1
+    по входам схемы). Схема должна быть скомпилирована с expand=True,
+    если нужны неисправности внутри TXor. В одном проходе моделируется
+    lanes неисправностей; с workers группы делятся между процессами."""
+    if faults is None:
+        faults = enumerate_faults(circuit)
+    tests = [tuple(test) for test in tests]
+    groups = [faults[i:i + lanes] for i in range(0, len(faults), lanes)]
+    shared = (circuit.instructions, len(circuit.inputs), circuit.output_slots, tests)
+    pairs = [[(f.slot, f.value) for f in group] for group in groups]
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_share, initargs=shared) as pool:
+            results = list(pool.map(_detect_shared, pairs))
+    else:
+        results = [_detect(*shared[:3], group, tests) for group in pairs]
+
+    detected, undetected = [], []
+    for group, result in zip(groups, results):
+        for fault, hit in zip(group, result):
+            (detected if hit else undetected).append(fault)
+    return FaultReport(detected, undetected)
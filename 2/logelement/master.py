@@ -1,42 +1,59 @@
+from collections import deque
+
+
 class TLogElement:
+    # Без __dict__: схемы из сотен тысяч элементов заметно легче.
+    __slots__ = ("__in1", "__in2", "_res", "__next", "__fresh")
+
     def __init__(self):
         self.__in1 = False
         self.__in2 = False
         self._res = False
         if not hasattr(self, "calc"):
             raise NotImplementedError("Нельзя создать такой объект!")
-        self.__nextEl = None
-        self.__nextIn = 0
+        self.__next = []
+        self.__fresh = True
 
     def link(self, nextEl, nextIn):
-        self.__nextEl = nextEl
-        self.__nextIn = nextIn
+        self.__next.append((nextEl, nextIn))
+
+    def unlink(self, nextEl, nextIn):
+        self.__next.remove((nextEl, nextIn))
+
+    def __setIn(self, pin, value):
+        # Изменения расходятся по схеме через очередь, а не рекурсией.
+        # Дальше передаём только изменившийся выход; первый расчёт элемента
+        # передаётся всегда, чтобы последователи получили начальные значения.
+        queue = deque([(self, pin, value)])
+        while queue:
+            el, pin, value = queue.popleft()
+            if pin == 1:
+                el.__in1 = value
+            else:
+                el.__in2 = value
+            old = el._res
+            el.calc()
+            if el._res == old and not el.__fresh:
+                continue
+            el.__fresh = False
+            for nextEl, nextIn in el.__next:
+                queue.append((nextEl, nextIn, el._res))
 
     def __setIn1(self, newIn1):
-        self.__in1 = newIn1
-
-        self.calc()
-        if self.__nextEl:
-            if self.__nextIn == 1:
-                self.__nextEl.In1 = self._res
-            elif self.__nextIn == 2:
-                self.__nextEl.In2 = self._res
+        self.__setIn(1, newIn1)
 
     def __setIn2(self, newIn2):
-        self.__in2 = newIn2
-        self.calc()
-        if self.__nextEl:
-            if self.__nextIn == 1:
-                self.__nextEl.In1 = self._res
-            elif self.__nextIn == 2:
-                self.__nextEl.In2 = self._res
+        self.__setIn(2, newIn2)
 
     In1 = property(lambda x: x.__in1, __setIn1)
     In2 = property(lambda x: x.__in2, __setIn2)
     Res = property(lambda x: x._res)
+    Links = property(lambda x: list(x.__next))
 
 
 class TNot(TLogElement):
+    __slots__ = ()
+
     def __init__(self):
         TLogElement.__init__(self)
 
@@ -45,10 +62,12 @@ class TNot(TLogElement):
 
 
 class TLog2In(TLogElement):
-    pass
+    __slots__ = ()
 
 
 class TAnd(TLog2In):
+    __slots__ = ()
+
     def __init__(self):
         TLog2In.__init__(self)
 
@@ -57,6 +76,8 @@ class TAnd(TLog2In):
 
 
 class TOr(TLog2In):
+    __slots__ = ()
+
     def __init__(self):
         TLog2In.__init__(self)
 
@@ -0,0 +1,188 @@
+"""Текстовый формат схем и генераторы больших схем.
+
+Формат - по одной записи в строке, ``#`` начинает комментарий::
+
+    INPUT a b cin
+    XOR x a b
+    AND t a b
+    OUTPUT x t
+
+Строка элемента: ``<тип> <имя> <вход1> [<вход2>]``, где тип - AND, OR,
+NOT или XOR, а входы - имена входов схемы или уже описанных элементов.
+Элементы описываются до использования, поэтому файл читается потоком,
+одним проходом, и целиком в памяти не держится.
+
+load_netlist строит объекты TLogElement - около полукилобайта на
+элемент. Для схем в сотни тысяч элементов, которые нужно только
+вычислять, легче GateStore.from_netlist: около 10 байт на элемент.
+"""
+from .master import TNot, TAnd, TOr
+from .xor import TXorV2
+from .compiler import ARITY, Circuit, gate_op
+
+GATES = {"AND": TAnd, "OR": TOr, "NOT": TNot, "XOR": TXorV2}
+
+
+class Netlist:
+    def __init__(self):
+        self.inputs = {}
+        self.gates = {}
+        self.outputs = {}
+
+    def set_inputs(self, values):
+        for name, value in values.items():
+            for el, pin in self.inputs[name]:
+                if pin == 1:
+                    el.In1 = bool(value)
+                else:
+                    el.In2 = bool(value)
+
+    def read_outputs(self):
+        return {name: el.Res for name, el in self.outputs.items()}
+
+    def compile(self, expand=False):
+        return Circuit(self.gates.values(), inputs=list(self.inputs.values()),
+                       outputs=list(self.outputs.values()), expand=expand)
+
+
+def load_netlist(lines, gates=GATES):
+    netlist = Netlist()
+    for number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].split()
+        if not line:
+            continue
+        kind, *names = line
+        kind = kind.upper()
+        if kind == "INPUT":
+            for name in names:
+                netlist.inputs[name] = []
+        elif kind == "OUTPUT":
+            for name in names:
+                if name not in netlist.gates:
+                    raise ValueError(f"Строка {number}: выход {name} - не элемент схемы")
+                netlist.outputs[name] = netlist.gates[name]
+        elif kind in gates:
+            el = gates[kind]()
+            arity = ARITY[gate_op(el)]
+            if len(names) != arity + 1:
+                raise ValueError(f"Строка {number}: у {kind} должно быть входов: {arity}")
+            name, *args = names
+            for pin, arg in enumerate(args, 1):
+                if arg in netlist.gates:
+                    netlist.gates[arg].link(el, pin)
+                elif arg in netlist.inputs:
+                    netlist.inputs[arg].append((el, pin))
+                else:
+                    raise ValueError(f"Строка {number}: неизвестный сигнал {arg}")
+            netlist.gates[name] = el
+        else:
+            raise ValueError(f"Строка {number}: неизвестный элемент {kind}")
+    return netlist
+
+
+def load_netlist_file(path, gates=GATES):
+    with open(path) as f:
+        return load_netlist(f, gates)
+
+
+def write_netlist(path, lines):
+    with open(path, "w") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+class _Names:
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return f"{self.prefix}{self.count}"
+
+
+def _full_adder(a, b, c, new, out):
+    """Строки полного сумматора; возвращает имена суммы и переноса."""
+    x, t1, t2, s, carry = new(), new(), new(), new(), new()
+    out += [f"XOR {x} {a} {b}", f"XOR {s} {x} {c}",
+            f"AND {t1} {a} {b}", f"AND {t2} {x} {c}", f"OR {carry} {t1} {t2}"]
+    return s, carry
+
+
+def _half_adder(a, b, new, out):
+    s, carry = new(), new()
+    out += [f"XOR {s} {a} {b}", f"AND {carry} {a} {b}"]
+    return s, carry
+
+
+def ripple_carry_adder(n):
+    """n-битный сумматор: входы a0.., b0.., cin; выходы s0.., cout."""
+    a = [f"a{i}" for i in range(n)]
+    b = [f"b{i}" for i in range(n)]
+    yield "INPUT " + " ".join(a + b + ["cin"])
+    new = _Names("g")
+    carry = "cin"
+    sums = []
+    for i in range(n):
+        out = []
+        s, carry = _full_adder(a[i], b[i], carry, new, out)
+        yield from out
+        sums.append(s)
+    yield "OUTPUT " + " ".join(sums + [carry])
+
+
+def multiplier(n):
+    """Матричный умножитель n x n бит: входы a0.., b0..; 2n выходов."""
+    a = [f"a{i}" for i in range(n)]
+    b = [f"b{i}" for i in range(n)]
+    yield "INPUT " + " ".join(a + b)
+    new = _Names("m")
+
+    def row(i):
+        names = []
+        for j in range(n):
+            name = new()
+            yield f"AND {name} {a[j]} {b[i]}"
+            names.append(name)
+        return names
+
+    acc = yield from row(0)
+    result = [acc[0]]
+    acc = acc[1:]
+    for i in range(1, n):
+        pp = yield from row(i)
+        out = []
+        s, carry = _half_adder(acc[0], pp[0], new, out)
+        bits = [s]
+        for j in range(1, n):
+            if j < len(acc):
+                s, carry = _full_adder(acc[j], pp[j], carry, new, out)
+            else:
+                s, carry = _half_adder(pp[j], carry, new, out)
+            bits.append(s)
+        yield from out
+        result.append(bits[0])
+        acc = bits[1:] + [carry]
+    yield "OUTPUT " + " ".join(result + acc)
+
+
+def parity_tree(n):
+    """Сбалансированное дерево XOR над n входами: выход p = чётность."""
+    level = [f"x{i}" for i in range(n)]
+    yield "INPUT " + " ".join(level)
+    new = _Names("p")
+    while len(level) > 1:
+        nxt = []
+        for i in range(0, len(level) - 1, 2):
+            name = new()
+            yield f"XOR {name} {level[i]} {level[i + 1]}"
+            nxt.append(name)
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    if n == 1:
+        # OUTPUT называет только элементы: вход выводится через повторитель.
+        name = new()
+        yield f"AND {name} x0 x0"
+        level = [name]
+    yield "OUTPUT " + level[0]
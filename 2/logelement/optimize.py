@@ -0,0 +1,194 @@
+"""Упрощение схем.
+
+Схема компилируется с развёрнутыми TXor, после чего за один проход в
+топологическом порядке выполняются:
+  * распространение констант (входы, заданные через constants) и
+    тождества вида x & 1 = x, x | ~x = 1, x ^ x = 0;
+  * снятие двойного отрицания not(not x) = x;
+  * распознавание XOR, собранного из четырёх элементов, как в TXor;
+  * слияние одинаковых подвыражений (с учётом перестановки входов);
+  * удаление элементов, от которых не зависит ни один выход.
+Результат можно собрать обратно в связанные элементы через build().
+"""
+from .compiler import Circuit
+from .netlist import load_netlist
+
+COMMUTATIVE = {"and", "or", "xor"}
+
+
+def circuit_depth(n_inputs, instructions, output_slots):
+    depth = [0] * (n_inputs + len(instructions))
+    for i, (op, a, b) in enumerate(instructions):
+        depth[n_inputs + i] = 1 + max(depth[a], depth[b] if b >= 0 else 0)
+    return max((depth[s] for s in output_slots), default=0)
+
+
+class Optimized:
+    """Упрощённая схема в формате команд Circuit. Выход - номер ячейки
+    или константа ("const", 0/1)."""
+
+    def __init__(self, n_inputs, instructions, outputs, before):
+        self.n_inputs = n_inputs
+        self.instructions = instructions
+        self.outputs = outputs
+        self.before = before
+
+    @property
+    def after(self):
+        slots = [s for s in self.outputs if not isinstance(s, tuple)]
+        return len(self.instructions), circuit_depth(self.n_inputs, self.instructions, slots)
+
+    def report(self):
+        (gates0, depth0), (gates1, depth1) = self.before, self.after
+        return f"Элементов: {gates0} -> {gates1}, глубина: {depth0} -> {depth1}"
+
+    def to_netlist(self):
+        names = [f"i{i}" for i in range(self.n_inputs)]
+        yield "INPUT " + " ".join(names)
+        for i, (op, a, b) in enumerate(self.instructions):
+            name = f"g{i}"
+            args = names[a] if b < 0 else f"{names[a]} {names[b]}"
+            yield f"{op.upper()} {name} {args}"
+            names.append(name)
+
+        # В формате нет констант и проводов, а выходы различаются по
+        # имени: выход, равный входу, константе или уже выведенному
+        # элементу, получает свой элемент-повторитель.
+        outputs = []
+        for k, slot in enumerate(self.outputs):
+            name = f"o{k}"
+            if isinstance(slot, tuple):
+                yield f"NOT n{k} i0"
+                yield f"{'OR' if slot[1] else 'AND'} {name} i0 n{k}"
+            elif slot < self.n_inputs or names[slot] in outputs:
+                yield f"AND {name} {names[slot]} {names[slot]}"
+            else:
+                name = names[slot]
+            outputs.append(name)
+        yield "OUTPUT " + " ".join(outputs)
+
+    def build(self):
+        """Связанные элементы TNot/TAnd/TOr/TXorV2 в виде Netlist."""
+        return load_netlist(self.to_netlist())
+
+
+class _Builder:
+    def __init__(self, n_inputs):
+        self.n_inputs = n_inputs
+        self.instructions = []
+        self.table = {}
+
+    def const(self, value):
+        return ("const", int(value))
+
+    def is_const(self, ref):
+        return isinstance(ref, tuple)
+
+    def node(self, ref):
+        if self.is_const(ref) or ref < self.n_inputs:
+            return None
+        return self.instructions[ref - self.n_inputs]
+
+    def negation_of(self, x, y):
+        node = self.node(y)
+        if node and node[0] == "not" and node[1] == x:
+            return True
+        node = self.node(x)
+        return bool(node and node[0] == "not" and node[1] == y)
+
+    def emit(self, op, a, b=-1):
+        if op in COMMUTATIVE and a > b:
+            a, b = b, a
+        key = (op, a, b)
+        if key not in self.table:
+            self.instructions.append(key)
+            self.table[key] = self.n_inputs + len(self.instructions) - 1
+        return self.table[key]
+
+    def gate(self, op, a, b=-1):
+        if op == "not":
+            if self.is_const(a):
+                return self.const(not a[1])
+            node = self.node(a)
+            if node and node[0] == "not":
+                return node[1]
+            return self.emit("not", a)
+
+        if self.is_const(a) and not self.is_const(b):
+            a, b = b, a
+        if self.is_const(b):
+            if self.is_const(a):
+                x, y = a[1], b[1]
+                return self.const({"and": x & y, "or": x | y, "xor": x ^ y}[op])
+            if op == "and":
+                return a if b[1] else b
+            if op == "or":
+                return b if b[1] else a
+            return self.gate("not", a) if b[1] else a
+
+        if a == b:
+            return self.const(0) if op == "xor" else a
+        if self.negation_of(a, b):
+            return self.const(op != "and")
+
+        if op == "and":
+            xor = self._match_xor(a, b) or self._match_xor(b, a)
+            if xor is not None:
+                return xor
+        return self.emit(op, a, b)
+
+    def _match_xor(self, left, right):
+        # and(or(x, y), not(and(x, y))) - так устроен TXor.
+        node_or, node_not = self.node(left), self.node(right)
+        if not (node_or and node_not and node_or[0] == "or" and node_not[0] == "not"):
+            return None
+        node_and = self.node(node_not[1])
+        if node_and and node_and[0] == "and" and sorted(node_and[1:]) == sorted(node_or[1:]):
+            return self.emit("xor", node_or[1], node_or[2])
+        return None
+
+
+def _eliminate_dead(n_inputs, instructions, outputs):
+    live = [False] * len(instructions)
+    for slot in outputs:
+        if not isinstance(slot, tuple) and slot >= n_inputs:
+            live[slot - n_inputs] = True
+    for i in range(len(instructions) - 1, -1, -1):
+        if live[i]:
+            op, a, b = instructions[i]
+            for arg in (a, b):
+                if arg >= n_inputs:
+                    live[arg - n_inputs] = True
+
+    renumber = list(range(n_inputs))
+    kept = []
+    for i, (op, a, b) in enumerate(instructions):
+        if live[i]:
+            kept.append((op, renumber[a], renumber[b] if b >= 0 else -1))
+            renumber.append(n_inputs + len(kept) - 1)
+        else:
+            renumber.append(None)
+    outputs = [slot if isinstance(slot, tuple) else renumber[slot] for slot in outputs]
+    return kept, outputs
+
+
+def optimize(circuit, constants=None):
+    """Упрощение скомпилированной схемы. constants - {номер входа: 0/1}."""
+    n_inputs = len(circuit.inputs)
+    before = (len(circuit.instructions),
+              circuit_depth(n_inputs, circuit.instructions, circuit.output_slots))
+
+    builder = _Builder(n_inputs)
+    refs = [builder.const(constants[i]) if constants and i in constants else i
+            for i in range(n_inputs)]
+    for op, a, b in circuit.instructions:
+        refs.append(builder.gate(op, refs[a], refs[b] if b >= 0 else -1))
+
+    outputs = [refs[slot] for slot in circuit.output_slots]
+    instructions, outputs = _eliminate_dead(n_inputs, builder.instructions, outputs)
+    return Optimized(n_inputs, instructions, outputs, before)
+
+
+def optimize_network(elements, inputs=None, outputs=None, constants=None):
+    """То же для связанных элементов: TXor разворачивается перед упрощением."""
+    return optimize(Circuit(elements, inputs, outputs, expand=True), constants)
@@ -0,0 +1,197 @@
+"""Последовательные схемы: D-триггеры, регистры и элементы с задержкой.
+
+TDFlipFlop - триггер в привычном объектном интерфейсе: In1 - вход D,
+In2 - синхросигнал, по фронту 0 -> 1 выход Res запоминает D.
+
+SeqCircuit - событийная модель для долгих прогонов: сигналы хранятся
+в bytearray, у каждого элемента своя задержка, а события планируются в
+колесе времени. Обрабатываются только события, меняющие значение
+сигнала, и пересчитываются только элементы, чей вход изменился.
+"""
+from heapq import heappush, heappop
+
+from .master import TLogElement
+
+
+class TDFlipFlop(TLogElement):
+    def __init__(self):
+        self._clock = False
+        TLogElement.__init__(self)
+
+    def calc(self):
+        if self.In2 and not self._clock:
+            self._res = self.In1
+        self._clock = self.In2
+
+
+class TimingWheel:
+    """Планировщик событий: кольцо из size ячеек по одной на такт
+    ближайшего будущего, дальние события ждут в куче."""
+
+    def __init__(self, size=64):
+        self.size = size
+        self.buckets = [[] for _ in range(size)]
+        self.overflow = []
+        self.now = 0
+        self.pending = 0
+        self._seq = 0
+
+    def schedule(self, delay, event):
+        if delay < 1:
+            raise ValueError("Задержка должна быть положительной")
+        if delay < self.size:
+            self.buckets[(self.now + delay) % self.size].append(event)
+            self.pending += 1
+        else:
+            self._seq += 1
+            heappush(self.overflow, (self.now + delay, self._seq, event))
+
+    def next_time(self):
+        """Момент ближайшего события или None."""
+        time = None
+        if self.pending:
+            for step in range(1, self.size):
+                if self.buckets[(self.now + step) % self.size]:
+                    time = self.now + step
+                    break
+        if self.overflow and (time is None or self.overflow[0][0] < time):
+            time = self.overflow[0][0]
+        return time
+
+    def pop(self, time):
+        """События момента time, который должен быть ближайшим."""
+        self.now = time
+        while self.overflow and self.overflow[0][0] < time + self.size:
+            when, _, event = heappop(self.overflow)
+            self.buckets[when % self.size].append(event)
+            self.pending += 1
+        bucket = self.buckets[time % self.size]
+        self.buckets[time % self.size] = []
+        self.pending -= len(bucket)
+        return bucket
+
+
+class SeqCircuit:
+    NOT, AND, OR, XOR, DFF = range(5)
+    _OPS = {"not": NOT, "and": AND, "or": OR, "xor": XOR}
+
+    def __init__(self, wheel_size=64):
+        self.values = bytearray()
+        self.names = {}
+        self.fanout = []
+        self.gates = []
+        self.projected = bytearray()
+        self.wheel = TimingWheel(wheel_size)
+        self.events = 0
+        self._settled = False
+
+    def add_net(self, name=None):
+        net = len(self.values)
+        self.values.append(0)
+        self.projected.append(0)
+        self.fanout.append([])
+        if name is not None:
+            self.names[name] = net
+        return net
+
+    def _add(self, kind, a, b, delay, name, out):
+        if out is None:
+            out = self.add_net(name)
+        index = len(self.gates)
+        # Для триггера в last хранится предыдущее значение синхросигнала.
+        self.gates.append([kind, a, b, out, delay, 0])
+        self.fanout[a].append(index)
+        if b >= 0:
+            self.fanout[b].append(index)
+        return out
+
+    def add_gate(self, op, a, b=-1, delay=1, name=None, out=None):
+        """Элемент с задержкой delay; out - уже созданный сигнал, которым
+        элемент должен управлять (нужно для обратных связей через триггеры)."""
+        return self._add(self._OPS[op], a, b, delay, name, out)
+
+    def add_dff(self, d, clk, delay=1, name=None):
+        return self._add(self.DFF, d, clk, delay, name, None)
+
+    def add_register(self, ds, clk, delay=1, name=None):
+        return [self.add_dff(d, clk, delay, name and f"{name}{i}") for i, d in enumerate(ds)]
+
+    def set(self, net, value, delay=1):
+        self._schedule(net, int(bool(value)), delay)
+
+    def clock(self, net, half_period):
+        """Синхросигнал с периодом 2 * half_period, первый фронт через half_period."""
+        self.wheel.schedule(half_period, (net, 1, half_period))
+
+    def _schedule(self, net, value, delay):
+        if self.projected[net] != value:
+            self.projected[net] = value
+            self.wheel.schedule(delay, (net, value, 0))
+
+    def _evaluate(self, index):
+        gate = self.gates[index]
+        kind, a, b, out, delay, last = gate
+        values = self.values
+        if kind == self.DFF:
+            clk = values[b]
+            gate[5] = clk
+            if clk and not last:
+                self._schedule(out, values[a], delay)
+            return
+        if kind == self.NOT:
+            value = values[a] ^ 1
+        elif kind == self.AND:
+            value = values[a] & values[b]
+        elif kind == self.OR:
+            value = values[a] | values[b]
+        else:
+            value = values[a] ^ values[b]
+        self._schedule(out, value, delay)
+
+    def run(self, until):
+        """Моделирование до момента until включительно."""
+        if not self._settled:
+            self._settled = True
+            for index in range(len(self.gates)):
+                self._evaluate(index)
+
+        values, fanout, wheel = self.values, self.fanout, self.wheel
+        while True:
+            time = wheel.next_time()
+            if time is None or time > until:
+                break
+            touched = set()
+            for net, value, repeat in wheel.pop(time):
+                if repeat:
+                    wheel.schedule(repeat, (net, value ^ 1, repeat))
+                    self.projected[net] = value
+                if values[net] != value:
+                    values[net] = value
+                    self.events += 1
+                    touched.update(fanout[net])
+            for index in touched:
+                self._evaluate(index)
+        wheel.now = max(wheel.now, until)
+
+    def read(self, nets):
+        """Число из битов nets, младший бит первый."""
+        return sum(self.values[net] << i for i, net in enumerate(nets))
+
+
+def counter(bits, half_period=8, delay=1):
+    """Синхронный двоичный счётчик: (схема, выходы триггеров).
+    Полупериод должен превышать задержку цепочки переноса."""
+    circuit = SeqCircuit()
+    clk = circuit.add_net("clk")
+    ds = [circuit.add_net() for _ in range(bits)]
+    qs = circuit.add_register(ds, clk, delay, "q")
+
+    # Входы D подключаются после создания триггеров: d0 = not q0,
+    # d_i = q_i xor c_i, c_(i+1) = q_i and c_i, c_1 = q0.
+    circuit.add_gate("not", qs[0], delay=delay, out=ds[0])
+    carry = qs[0]
+    for i in range(1, bits):
+        circuit.add_gate("xor", qs[i], carry, delay=delay, out=ds[i])
+        carry = circuit.add_gate("and", qs[i], carry, delay)
+    circuit.clock(clk, half_period)
+    return circuit, qs
@@ -0,0 +1,179 @@
+"""Хранение схемы столбцами вместо объектов.
+
+Тип элемента, номера ячеек-входов и значения лежат в типизированных
+массивах: около 10 байт на элемент против сотен у объекта TLogElement.
+Ячейки устроены как в Circuit: сначала входы схемы, затем элементы в
+топологическом порядке. Привычный интерфейс In1/In2/Res дают лёгкие
+представления element(i), которые сами ничего не хранят.
+"""
+from array import array
+
+from .compiler import ARITY
+from .master import TNot, TAnd, TOr
+from .xor import TXorV2
+
+
+OP_CODES = {"not": 0, "and": 1, "or": 2, "xor": 3}
+NETLIST_OPS = {"AND": "and", "OR": "or", "NOT": "not", "XOR": "xor"}
+
+
+class GateStore:
+    def __init__(self, n_inputs=0):
+        self.n_inputs = n_inputs
+        self.ops = array("b")
+        self.in1 = array("i")
+        self.in2 = array("i")
+        self.values = bytearray(n_inputs)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def add_gate(self, op, a, b=-1):
+        slot = len(self.values)
+        if a >= slot or b >= slot:
+            raise ValueError("Входы элемента должны быть описаны раньше него")
+        self.ops.append(OP_CODES[op])
+        self.in1.append(a)
+        self.in2.append(b)
+        self.values.append(0)
+        return slot
+
+    def evaluate(self, start=0):
+        """Пересчёт элементов начиная с номера start (не ячейки)."""
+        ops, in1, in2, values = self.ops, self.in1, self.in2, self.values
+        slot = self.n_inputs + start
+        for i in range(start, len(ops)):
+            op = ops[i]
+            a = values[in1[i]]
+            if op == 0:
+                values[slot] = a ^ 1
+            elif op == 1:
+                values[slot] = a & values[in2[i]]
+            elif op == 2:
+                values[slot] = a | values[in2[i]]
+            else:
+                values[slot] = a ^ values[in2[i]]
+            slot += 1
+
+    def set_inputs(self, bits):
+        self.values[:self.n_inputs] = bytes(int(bool(b)) for b in bits)
+        self.evaluate()
+
+    def set_input(self, i, value):
+        self.values[i] = int(bool(value))
+        self.evaluate()
+
+    def element(self, slot):
+        op = self.ops[slot - self.n_inputs]
+        return _VIEWS[op](self, slot)
+
+    @classmethod
+    def from_circuit(cls, circuit):
+        store = cls(len(circuit.inputs))
+        for op, a, b in circuit.instructions:
+            store.add_gate(op, a, b)
+        return store
+
+    @classmethod
+    def from_netlist(cls, lines):
+        """Загрузка текстового формата netlist без создания объектов.
+        Возвращает хранилище и номера ячеек выходов по именам."""
+        slots = {}
+        outputs = {}
+        store = None
+        for number, line in enumerate(lines, 1):
+            line = line.split("#", 1)[0].split()
+            if not line:
+                continue
+            kind, *names = line
+            kind = kind.upper()
+            if kind == "INPUT":
+                if store is not None:
+                    raise ValueError(f"Строка {number}: входы описываются первыми")
+                slots = {name: i for i, name in enumerate(names)}
+                store = cls(len(names))
+            elif kind != "OUTPUT" and kind not in NETLIST_OPS:
+                raise ValueError(f"Строка {number}: неизвестный элемент {kind}")
+            elif store is None:
+                raise ValueError(f"Строка {number}: нет строки INPUT перед {kind}")
+            elif kind == "OUTPUT":
+                for name in names:
+                    if name not in slots:
+                        raise ValueError(f"Строка {number}: неизвестный выход {name}")
+                    outputs[name] = slots[name]
+            else:
+                op = NETLIST_OPS[kind]
+                if len(names) != ARITY[op] + 1:
+                    raise ValueError(f"Строка {number}: у {kind} должно быть входов: {ARITY[op]}")
+                name, *args = names
+                try:
+                    store.add_gate(op, *(slots[arg] for arg in args))
+                except KeyError as e:
+                    raise ValueError(f"Строка {number}: неизвестный сигнал {e.args[0]}")
+                slots[name] = len(store.values) - 1
+        if store is None:
+            raise ValueError("Нет строки INPUT")
+        return store, outputs
+
+
+class StoredElement:
+    """Представление элемента из GateStore с интерфейсом TLogElement.
+
+    Записывать можно только в выводы, подключённые ко входам схемы:
+    остальные выводы определяются связями внутри хранилища.
+    """
+
+    def __init__(self, store, slot):
+        # TLogElement.__init__ не вызывается: состояние живёт в store.
+        self.store = store
+        self.slot = slot
+
+    @property
+    def _gate(self):
+        return self.slot - self.store.n_inputs
+
+    def _source(self, pin):
+        return (self.store.in1 if pin == 1 else self.store.in2)[self._gate]
+
+    def _read(self, pin):
+        source = self._source(pin)
+        # У TNot второго входа нет: in2 = -1, а не номер сигнала.
+        return bool(self.store.values[source]) if source >= 0 else False
+
+    def _write(self, pin, value):
+        source = self._source(pin)
+        if source < 0:
+            raise ValueError("У элемента нет такого входа")
+        if not 0 <= source < self.store.n_inputs:
+            raise ValueError("Вывод подключён к другому элементу")
+        self.store.set_input(source, value)
+
+    def link(self, nextEl, nextIn):
+        raise TypeError("Связи элементов хранилища задаются при его построении")
+
+    In1 = property(lambda x: x._read(1), lambda x, v: x._write(1, v))
+    In2 = property(lambda x: x._read(2), lambda x, v: x._write(2, v))
+    Res = property(lambda x: bool(x.store.values[x.slot]))
+    Links = property(lambda x: [])
+
+    def calc(self):
+        self.store.evaluate(self._gate)
+
+
+class StoredNot(StoredElement, TNot):
+    pass
+
+
+class StoredAnd(StoredElement, TAnd):
+    pass
+
+
+class StoredOr(StoredElement, TOr):
+    pass
+
+
+class StoredXor(StoredElement, TXorV2):
+    pass
+
+
+_VIEWS = [StoredNot, StoredAnd, StoredOr, StoredXor]
@@ -2,6 +2,8 @@ from .master import *
 
 
 class TXor(TLog2In):
+    __slots__ = ("_or", "_and", "_notAnd", "_finalAnd")
+
     def __init__(self):
         TLog2In.__init__(self)
         self._or = TOr()
@@ -23,6 +25,8 @@ class TXor(TLog2In):
 
 
 class TXorV2(TLog2In):
+    __slots__ = ()
+
     def __init__(self):
         TLog2In.__init__(self)
 
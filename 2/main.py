@@ -1,4 +1,5 @@
 from logelement import master
+from logelement import compile_circuit, BitSimulator, unpack, equivalent, TXor, TXorV2
 
 elNot = master.TNot()
 elAnd = master.TAnd()
@@ -13,3 +14,14 @@ for A in range(2):
         elAnd.In2 = bool(B)
         print(" ", A, "|", B, "|", int(elNot.Res))
 
+
+# То же самое сразу для всех наборов: схема компилируется,
+# а наборы упаковываются в биты чисел.
+circuit = compile_circuit([elAnd])
+print()
+print("Битово-параллельно:")
+result = BitSimulator(circuit).truth_table()[0]
+for row, bit in enumerate(unpack(result, 4)):
+    print(" ", row >> 1, "|", row & 1, "|", bit)
+
+print("TXor == TXorV2:", equivalent(compile_circuit([TXor()]), compile_circuit([TXorV2()])))
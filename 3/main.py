@@ -1,6 +1,11 @@
-import math
 import random
+import time
 import tkinter as tk
+from collections import deque
+
+import numpy as np
+
+from spatial import knn_edges, emst_edges, gabriel_edges
 
 
 class Point:
@@ -29,143 +34,340 @@ def random_color():
     return random.choice(COLORS)
 
 
-def points():
-    canvas.delete("all")
+def points(target=None, count=5):
+    target = target or pool
+    target.delete("all")
     points = []
-    for _ in range(5):
+    for _ in range(count):
         point = Point(random.randint(0, 400), random.randint(0, 400), 2)
-        canvas.create_oval(*point.get_coords(), fill='red')
+        target.create_oval(*point.get_coords(), fill='red')
         points.append(point)
     SetPoints.points = points
 
 
-def draw_random_line(line=5):
+def draw_random_line(line=5, target=None):
+    target = target or pool
     for i in range(line):
         gb = random.sample(SetPoints.points, 2)
-        canvas.create_line(*gb[0](), *gb[1](), fill='blue', width=3)
+        target.create_line(*gb[0](), *gb[1](), fill='blue', width=3)
+
+
+def _draw_edges(edges, target):
+    pts = SetPoints.points
+    for i, j in edges:
+        target.create_line(*pts[i](), *pts[j](), fill='blue', width=1)
+
+
+def draw_neighbour_lines(k=3, target=None):
+    """Каждая точка соединяется с k ближайшими."""
+    _draw_edges(knn_edges([(p.x, p.y) for p in SetPoints.points], k), target or pool)
+
 
+def draw_spanning_tree(target=None):
+    """Евклидово минимальное остовное дерево по точкам."""
+    _draw_edges(emst_edges([(p.x, p.y) for p in SetPoints.points]), target or pool)
 
-def rectangles(count=1):
+
+def draw_mesh(target=None):
+    """Сетка из рёбер графа Габриэля, похожая на триангуляцию Делоне."""
+    _draw_edges(gabriel_edges([(p.x, p.y) for p in SetPoints.points]), target or pool)
+
+
+def rectangles(count=1, target=None):
+    target = target or pool
     for _ in range(count):
         x1 = random.randint(0, 350)
         y1 = random.randint(0, 350)
         x2 = x1 + random.randint(20, 80)
         y2 = y1 + random.randint(20, 80)
-        canvas.create_rectangle(x1, y1, x2, y2,
+        target.create_rectangle(x1, y1, x2, y2,
                                 fill=random_color(),
                                 outline='black',
                                 width=1)
 
 
-def ellipses(count=1):
+def ellipses(count=1, target=None):
+    target = target or pool
     for _ in range(count):
         x1 = random.randint(0, 350)
         y1 = random.randint(0, 350)
         x2 = x1 + random.randint(30, 100)
         y2 = y1 + random.randint(20, 60)
-        canvas.create_oval(x1, y1, x2, y2,
+        target.create_oval(x1, y1, x2, y2,
                            fill=random_color(),
                            outline='black',
                            width=2)
 
 
-def triangles(count=1):
-    for _ in range(count):
-        cx = random.randint(50, 350)
-        cy = random.randint(50, 350)
-        size = random.randint(20, 50)
-
-        points = []
-        for i in range(3):
-            angle = math.radians(i * 120 - 90 + random.randint(-20, 20))
-            x = cx + size * math.cos(angle)
-            y = cy + size * math.sin(angle)
-            points.extend([x, y])
-
-        canvas.create_polygon(points,
-                              fill=random_color(),
+def _rng():
+    # Генератор numpy засевается из random, чтобы random.seed() по-прежнему
+    # задавал всю картинку.
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def triangle_coords(count, rng=None):
+    """Вершины count треугольников массивом (count, 6): x0, y0, x1, y1, x2, y2."""
+    rng = rng or _rng()
+    cx = rng.integers(50, 351, count)[:, None]
+    cy = rng.integers(50, 351, count)[:, None]
+    size = rng.integers(20, 51, count)[:, None]
+    angle = np.radians(np.arange(3) * 120 - 90 + rng.integers(-20, 21, (count, 3)))
+
+    coords = np.empty((count, 6))
+    coords[:, 0::2] = cx + size * np.cos(angle)
+    coords[:, 1::2] = cy + size * np.sin(angle)
+    return coords
+
+
+def star_coords(count, rng=None):
+    """Вершины count звёзд, сгруппированные по числу лучей:
+    {лучей: массив (m, 4 * лучей)}."""
+    rng = rng or _rng()
+    cx = rng.integers(50, 351, count)
+    cy = rng.integers(50, 351, count)
+    outer_r = rng.integers(20, 41, count)
+    num_points = rng.choice([5, 6, 8], count)
+
+    result = {}
+    for n in (5, 6, 8):
+        sel = num_points == n
+        if not sel.any():
+            continue
+        angle = np.radians(np.arange(2 * n) * 180 / n - 90)
+        # Чётные вершины на внешнем радиусе, нечётные - на внутреннем.
+        r = np.where(np.arange(2 * n) % 2 == 0, outer_r[sel, None], outer_r[sel, None] // 2)
+        coords = np.empty((sel.sum(), 4 * n))
+        coords[:, 0::2] = cx[sel, None] + r * np.cos(angle)
+        coords[:, 1::2] = cy[sel, None] + r * np.sin(angle)
+        result[n] = coords
+    return result
+
+
+def triangles(count=1, target=None):
+    target = target or pool
+    rng = _rng()
+    coords = triangle_coords(count, rng)
+    colors = rng.choice(COLORS, count)
+    for points, color in zip(coords.tolist(), colors):
+        target.create_polygon(points,
+                              fill=color,
                               outline='black',
                               width=2)
 
 
-def stars(count=1):
-    for _ in range(count):
-        cx = random.randint(50, 350)
-        cy = random.randint(50, 350)
-        outer_r = random.randint(20, 40)
-        inner_r = outer_r // 2
-        num_points = random.choice([5, 6, 8])
-
-        points = []
-        for i in range(num_points * 2):
-            angle = math.radians(i * 180 / num_points - 90)
-            r = outer_r if i % 2 == 0 else inner_r
-            x = cx + r * math.cos(angle)
-            y = cy + r * math.sin(angle)
-            points.extend([x, y])
-
-        canvas.create_polygon(points,
-                              fill=random_color(),
-                              outline='black',
-                              width=1)
+def stars(count=1, target=None):
+    target = target or pool
+    rng = _rng()
+    for coords in star_coords(count, rng).values():
+        colors = rng.choice(COLORS, len(coords))
+        for points, color in zip(coords.tolist(), colors):
+            target.create_polygon(points,
+                                  fill=color,
+                                  outline='black',
+                                  width=1)
 
 
-def circles(count=1):
+def circles(count=1, target=None):
+    target = target or pool
     for _ in range(count):
         cx = random.randint(50, 350)
         cy = random.randint(50, 350)
         r = random.randint(15, 40)
 
-        canvas.create_oval(cx - r, cy - r, cx + r, cy + r,
+        target.create_oval(cx - r, cy - r, cx + r, cy + r,
                            fill=random_color(),
                            outline='black',
                            width=2)
 
 
-def draw_all_shapes():
-    canvas.delete("all")
-    points()
-    draw_random_line(3)
-    ellipses(3)
-    triangles(3)
-    stars(2)
+def draw_all_shapes(target=None):
+    target = target or pool
+    target.delete("all")
+    points(target)
+    draw_random_line(3, target)
+    ellipses(3, target)
+    triangles(3, target)
+    stars(2, target)
 
 
 def clear_canvas():
-    canvas.delete("all")
+    pool.delete("all")
     SetPoints.points = []
 
 
-root = tk.Tk()
-root.title("Генератор фигур")
-
-canvas = tk.Canvas(root, width=400, height=400, bg='white')
-canvas.pack(pady=10)
-
-button_frame = tk.Frame(root)
-button_frame.pack()
-
-left_frame = tk.Frame(button_frame)
-left_frame.pack(side=tk.LEFT, padx=10)
-
-right_frame = tk.Frame(button_frame)
-right_frame.pack(side=tk.LEFT, padx=10)
-
-tk.Button(left_frame, text="Точки", command=points, width=20).pack(pady=2)
-tk.Button(left_frame, text="Линии", command=draw_random_line, width=20).pack(pady=2)
-tk.Button(left_frame, text="Прямоугольники", command=rectangles, width=20).pack(pady=2)
-
-tk.Button(right_frame, text="Круги", command=circles, width=20).pack(pady=2)
-tk.Button(right_frame, text="Треугольники", command=triangles, width=20).pack(pady=2)
-tk.Button(right_frame, text="Звёзды", command=stars, width=20).pack(pady=2)
-
-control_frame = tk.Frame(root)
-control_frame.pack(pady=10)
-
-tk.Button(control_frame, text="Нарисовать всё", command=draw_all_shapes,
-          width=20, bg='lightgreen').pack(side=tk.LEFT, padx=5)
-tk.Button(control_frame, text="Очистить", command=clear_canvas,
-          width=20, bg='lightcoral').pack(side=tk.LEFT, padx=5)
-
-
-root.mainloop()
+class ItemPool:
+    """Обёртка над холстом с тем же набором create_*/delete.
+
+    delete("all") не удаляет элементы, а прячет их; следующие create_*
+    берут спрятанный элемент того же вида и меняют ему coords и
+    параметры. Так таблица элементов Tk не перестраивается на каждом
+    кадре.
+    """
+
+    # Параметры по умолчанию, как у Tk: повторно используемый элемент
+    # не должен унаследовать чужие outline или width.
+    DEFAULTS = {
+        'oval': {'fill': '', 'outline': 'black', 'width': 1},
+        'rectangle': {'fill': '', 'outline': 'black', 'width': 1},
+        'polygon': {'fill': 'black', 'outline': '', 'width': 1},
+        'line': {'fill': 'black', 'width': 1},
+    }
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.free = {kind: [] for kind in self.DEFAULTS}
+        self.used = []
+
+    def _acquire(self, kind, args, options):
+        coords = []
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                coords.extend(arg)
+            else:
+                coords.append(arg)
+        options = {**self.DEFAULTS[kind], **options}
+
+        if self.free[kind]:
+            item = self.free[kind].pop()
+            self.canvas.coords(item, coords)
+            self.canvas.itemconfigure(item, state='normal', **options)
+            # Поверх уже нарисованного, как было бы у нового элемента.
+            self.canvas.tag_raise(item)
+        else:
+            item = getattr(self.canvas, 'create_' + kind)(coords, **options)
+        self.used.append((kind, item))
+        return item
+
+    def create_oval(self, *args, **options):
+        return self._acquire('oval', args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._acquire('rectangle', args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._acquire('polygon', args, options)
+
+    def create_line(self, *args, **options):
+        return self._acquire('line', args, options)
+
+    def delete(self, tag):
+        if tag != "all":
+            self.canvas.delete(tag)
+            return
+        for kind, item in self.used:
+            self.canvas.itemconfigure(item, state='hidden')
+            self.free[kind].append(item)
+        self.used = []
+
+    def __len__(self):
+        return len(self.used)
+
+
+class Animator:
+    """Перерисовка всех фигур по таймеру after() со статистикой кадров."""
+
+    def __init__(self, root, label, count_var, frame_ms=16):
+        self.root = root
+        self.label = label
+        self.count_var = count_var
+        self.frame_ms = frame_ms
+        self.times = deque(maxlen=120)
+        self.running = False
+
+    def toggle(self):
+        self.running = not self.running
+        if self.running:
+            self.times.clear()
+            self.tick()
+
+    def tick(self):
+        if not self.running:
+            return
+        start = time.perf_counter()
+        count = max(int(self.count_var.get()) // 4, 1)
+        pool.delete("all")
+        rectangles(count)
+        circles(count)
+        triangles(count)
+        stars(count)
+        # Учитываем и отрисовку, а не только подготовку элементов.
+        self.root.update_idletasks()
+        elapsed = time.perf_counter() - start
+        self.times.append(elapsed)
+
+        ordered = sorted(self.times)
+        mean = sum(ordered) / len(ordered)
+        p95 = ordered[int(len(ordered) * 0.95)]
+        self.label.config(text=f"{len(pool)} элементов: кадр {mean * 1000:.1f} мс "
+                               f"(95% - {p95 * 1000:.1f} мс), {1 / mean:.0f} кадр/с")
+        self.root.after(max(1, self.frame_ms - int(elapsed * 1000)), self.tick)
+
+
+pool = None
+
+
+def main():
+    global pool
+    root = tk.Tk()
+    root.title("Генератор фигур")
+
+    canvas = tk.Canvas(root, width=400, height=400, bg='white')
+    canvas.pack(pady=10)
+    pool = ItemPool(canvas)
+
+    button_frame = tk.Frame(root)
+    button_frame.pack()
+
+    left_frame = tk.Frame(button_frame)
+    left_frame.pack(side=tk.LEFT, padx=10)
+
+    right_frame = tk.Frame(button_frame)
+    right_frame.pack(side=tk.LEFT, padx=10)
+
+    points_var = tk.StringVar(value='5')
+    tk.Button(left_frame, text="Точки", command=lambda: points(count=int(points_var.get())),
+              width=20).pack(pady=2)
+    tk.Spinbox(left_frame, from_=2, to=100000, increment=100,
+               textvariable=points_var, width=8).pack(pady=2)
+    tk.Button(left_frame, text="Линии", command=draw_random_line, width=20).pack(pady=2)
+    tk.Button(left_frame, text="Прямоугольники", command=rectangles, width=20).pack(pady=2)
+
+    tk.Button(right_frame, text="Круги", command=circles, width=20).pack(pady=2)
+    tk.Button(right_frame, text="Треугольники", command=triangles, width=20).pack(pady=2)
+    tk.Button(right_frame, text="Звёзды", command=stars, width=20).pack(pady=2)
+
+    neighbour_frame = tk.Frame(button_frame)
+    neighbour_frame.pack(side=tk.LEFT, padx=10)
+
+    tk.Button(neighbour_frame, text="Ближайшие соседи", command=draw_neighbour_lines,
+              width=20).pack(pady=2)
+    tk.Button(neighbour_frame, text="Остовное дерево", command=draw_spanning_tree,
+              width=20).pack(pady=2)
+    tk.Button(neighbour_frame, text="Сетка", command=draw_mesh, width=20).pack(pady=2)
+
+    control_frame = tk.Frame(root)
+    control_frame.pack(pady=10)
+
+    tk.Button(control_frame, text="Нарисовать всё", command=draw_all_shapes,
+              width=20, bg='lightgreen').pack(side=tk.LEFT, padx=5)
+    tk.Button(control_frame, text="Очистить", command=clear_canvas,
+              width=20, bg='lightcoral').pack(side=tk.LEFT, padx=5)
+
+    animation_frame = tk.Frame(root)
+    animation_frame.pack(pady=5)
+
+    count_var = tk.StringVar(value='1000')
+    stats_label = tk.Label(root, text="")
+    animator = Animator(root, stats_label, count_var)
+    tk.Label(animation_frame, text="Фигур в кадре:").pack(side=tk.LEFT)
+    tk.Spinbox(animation_frame, from_=4, to=100000, increment=1000,
+               textvariable=count_var, width=8).pack(side=tk.LEFT, padx=5)
+    tk.Button(animation_frame, text="Анимация", command=animator.toggle,
+              width=20).pack(side=tk.LEFT, padx=5)
+    stats_label.pack(pady=5)
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
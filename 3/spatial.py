@@ -0,0 +1,189 @@
+"""Соседство точек через сетку-хеш.
+
+Плоскость режется на квадратные ячейки так, чтобы в ячейке было в
+среднем около двух точек. Поиск соседей обходит кольца ячеек вокруг
+точки и останавливается, как только следующее кольцо заведомо дальше
+уже найденного, поэтому запрос стоит O(1) в среднем, а не O(n).
+"""
+import heapq
+import math
+
+
+class SpatialGrid:
+    def __init__(self, points, per_cell=2):
+        self.points = [(float(x), float(y)) for x, y in points]
+        xs = [p[0] for p in self.points] or [0.0]
+        ys = [p[1] for p in self.points] or [0.0]
+        self.x0, self.y0 = min(xs), min(ys)
+        width = max(max(xs) - self.x0, 1e-9)
+        height = max(max(ys) - self.y0, 1e-9)
+        self.cell = max(math.sqrt(width * height * per_cell / max(len(self.points), 1)), 1e-9)
+        self.cols = int(width / self.cell) + 1
+        self.rows = int(height / self.cell) + 1
+        self.cells = {}
+        for i, p in enumerate(self.points):
+            self.cells.setdefault(self.key(p), []).append(i)
+
+    def key(self, p):
+        return int((p[0] - self.x0) / self.cell), int((p[1] - self.y0) / self.cell)
+
+    @staticmethod
+    def ring(cx, cy, r):
+        """Ячейки на расстоянии ровно r (по Чебышёву) от ячейки (cx, cy)."""
+        if r == 0:
+            return [(cx, cy)]
+        keys = [(cx + dx, cy - r) for dx in range(-r, r + 1)]
+        keys += [(cx + dx, cy + r) for dx in range(-r, r + 1)]
+        keys += [(cx - r, cy + dy) for dy in range(-r + 1, r)]
+        keys += [(cx + r, cy + dy) for dy in range(-r + 1, r)]
+        return keys
+
+    @property
+    def max_ring(self):
+        return max(self.cols, self.rows)
+
+    def nearest(self, i, k=1, skip=None, bound=math.inf):
+        """k ближайших к точке i: список (квадрат расстояния, номер).
+        skip(j) исключает точки; точки дальше bound не ищутся."""
+        points, cells = self.points, self.cells
+        px, py = points[i]
+        cx, cy = self.key(points[i])
+        best = []
+        bound2 = bound * bound
+        for r in range(self.max_ring + 1):
+            for key in self.ring(cx, cy, r):
+                bucket = cells.get(key)
+                if bucket is None:
+                    continue
+                for j in bucket:
+                    if j == i or (skip and skip(j)):
+                        continue
+                    qx, qy = points[j]
+                    d = (qx - px) * (qx - px) + (qy - py) * (qy - py)
+                    if d >= bound2:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, j))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, j))
+            # Всё в кольце r + 1 не ближе r ячеек от точки.
+            reach = (r * self.cell) ** 2
+            if reach >= bound2 or (len(best) == k and -best[0][0] <= reach):
+                break
+        return sorted((-d, j) for d, j in best)
+
+    def within(self, x, y, radius):
+        """Номера точек строго внутри круга."""
+        cx, cy = self.key((x, y))
+        span = int(radius / self.cell) + 1
+        r2 = radius * radius
+        for gx in range(cx - span, cx + span + 1):
+            for gy in range(cy - span, cy + span + 1):
+                for j in self.cells.get((gx, gy), ()):
+                    qx, qy = self.points[j]
+                    if (qx - x) ** 2 + (qy - y) ** 2 < r2:
+                        yield j
+
+
+def knn_edges(points, k=3, grid=None):
+    """Рёбра от каждой точки к k ближайшим, без повторов."""
+    grid = grid or SpatialGrid(points)
+    edges = set()
+    for i in range(len(grid.points)):
+        for _, j in grid.nearest(i, k):
+            edges.add((min(i, j), max(i, j)))
+    return sorted(edges)
+
+
+class _Components:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        self.parent[i] = j
+        return True
+
+
+def _offer(best, root, i, found):
+    d, j = found
+    candidate = (d, min(i, j), max(i, j))
+    if root not in best or candidate < best[root]:
+        best[root] = candidate
+
+
+def emst_edges(points, grid=None, k=8):
+    """Евклидово минимальное остовное дерево алгоритмом Борувки: в каждом
+    раунде для каждой компоненты ищется ближайшая точка из другой
+    компоненты.
+
+    У каждой точки один раз запоминаются k ближайших соседей. Первый
+    чужой из этого списка и есть ближайший чужой. Если все k уже свои,
+    ближайший чужой не ближе k-го соседа, и точка ищет в сетке, только
+    когда эта оценка лучше уже найденного ребра её компоненты, причём
+    поиск обрывается на расстоянии этого ребра.
+    """
+    grid = grid or SpatialGrid(points)
+    n = len(grid.points)
+    components = _Components(n)
+    neighbours = [grid.nearest(i, k) for i in range(n)]
+    start = [0] * n
+    cache = [None] * n
+    edges = []
+    count = n
+    while count > 1:
+        roots = [components.find(i) for i in range(n)]
+        best = {}
+        stale = []
+        for i in range(n):
+            root = roots[i]
+            own = neighbours[i]
+            # Свои остаются своими, поэтому указатель только растёт.
+            while start[i] < len(own) and roots[own[start[i]][1]] == root:
+                start[i] += 1
+            if start[i] < len(own):
+                _offer(best, root, i, own[start[i]])
+            elif cache[i] is not None and roots[cache[i][1]] != root:
+                _offer(best, root, i, cache[i])
+            else:
+                stale.append(i)
+        for i in stale:
+            root = roots[i]
+            lower = cache[i][0] if cache[i] is not None else (neighbours[i][-1][0] if neighbours[i] else 0)
+            if root in best and lower >= best[root][0]:
+                continue
+            bound = math.sqrt(best[root][0]) if root in best else math.inf
+            found = grid.nearest(i, 1, skip=lambda j: roots[j] == root, bound=bound)
+            # Найденное в пределах bound - настоящий ближайший чужой сосед.
+            if found:
+                cache[i] = found[0]
+                _offer(best, root, i, found[0])
+        for d, i, j in sorted(best.values()):
+            if components.union(i, j):
+                edges.append((i, j))
+                count -= 1
+    return edges
+
+
+def gabriel_edges(points, k=8, grid=None):
+    """Сетка в духе Делоне: граф Габриэля на кандидатах из k ближайших.
+    Ребро pq остаётся, если в круге с диаметром pq нет других точек;
+    такие рёбра всегда входят в триангуляцию Делоне."""
+    grid = grid or SpatialGrid(points)
+    edges = []
+    for i, j in knn_edges(points, k, grid):
+        (px, py), (qx, qy) = grid.points[i], grid.points[j]
+        mx, my = (px + qx) / 2, (py + qy) / 2
+        radius = math.hypot(px - qx, py - qy) / 2
+        if not any(m != i and m != j for m in grid.within(mx, my, radius)):
+            edges.append((i, j))
+    return edges
@@ -0,0 +1,270 @@
+"""Упорядоченные двоичные диаграммы решений (ROBDD).
+
+Узел - номер в массивах var/low/high, 0 и 1 - константы. Таблица
+уникальности не даёт создать два одинаковых узла, поэтому равносильные
+выражения над одним порядком переменных получают один и тот же номер, а
+равносильность проверяется сравнением номеров. Результаты apply
+запоминаются в кэше вычислений.
+
+Число выполняющих наборов, пример и равносильность получаются без
+перебора 2^n строк. Размер диаграммы сильно зависит от порядка
+переменных, поэтому порядок выбирается эвристиками.
+"""
+from collections import Counter
+
+from logic import check_variables
+
+FALSE, TRUE = 0, 1
+# Через столько новых узлов проверяется отмена и сообщается прогресс.
+CHECK_EVERY = 4096
+
+TERMINAL = {
+    'and': lambda a, b: a & b,
+    'or': lambda a, b: a | b,
+    'xor': lambda a, b: a ^ b,
+}
+
+
+class Cancelled(Exception):
+    """Построение диаграммы остановлено через stop."""
+
+
+class BDD:
+    def __init__(self, variables, stop=None, progress=None):
+        self.variables = list(variables)
+        self.level = {name: i for i, name in enumerate(self.variables)}
+        n = len(self.variables)
+        # У констант уровень n - ниже всех переменных.
+        self.var = [n, n]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.unique = {}
+        self.computed = {}
+        self.limit = None
+        # stop - threading.Event, progress(число узлов) - обратный вызов.
+        self.stop = stop
+        self.progress = progress
+
+    def __len__(self):
+        return len(self.var)
+
+    def mk(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            if self.limit is not None and len(self.var) >= self.limit:
+                raise OverflowError("Диаграмма больше допустимого размера")
+            node = len(self.var)
+            if not node % CHECK_EVERY:
+                if self.stop is not None and self.stop.is_set():
+                    raise Cancelled()
+                if self.progress is not None:
+                    self.progress(node)
+            self.var.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = node
+        return node
+
+    def variable(self, name):
+        return self.mk(self.level[name], FALSE, TRUE)
+
+    def apply(self, op, u, v):
+        if u <= TRUE and v <= TRUE:
+            return TERMINAL[op](u, v)
+        if op == 'and':
+            if u == FALSE or v == FALSE:
+                return FALSE
+            if u == TRUE or u == v:
+                return v
+            if v == TRUE:
+                return u
+        elif op == 'or':
+            if u == TRUE or v == TRUE:
+                return TRUE
+            if u == FALSE or u == v:
+                return v
+            if v == FALSE:
+                return u
+        elif op == 'xor':
+            if u == v:
+                return FALSE
+            if u == FALSE:
+                return v
+            if v == FALSE:
+                return u
+        # Операции симметричны: один ключ на пару.
+        if u > v:
+            u, v = v, u
+        key = (op, u, v)
+        result = self.computed.get(key)
+        if result is not None:
+            return result
+        level = min(self.var[u], self.var[v])
+        u0, u1 = (self.low[u], self.high[u]) if self.var[u] == level else (u, u)
+        v0, v1 = (self.low[v], self.high[v]) if self.var[v] == level else (v, v)
+        result = self.mk(level, self.apply(op, u0, v0), self.apply(op, u1, v1))
+        self.computed[key] = result
+        return result
+
+    def negate(self, u):
+        return self.apply('xor', u, TRUE)
+
+    def build(self, node):
+        """Диаграмма для дерева из logic.parse."""
+        if node.op == 'var':
+            return self.variable(node.value)
+        if node.op == 'const':
+            return TRUE if node.value else FALSE
+        if node.op == 'not':
+            return self.negate(self.build(node.args[0]))
+        a, b = (self.build(arg) for arg in node.args)
+        if node.op == 'imp':
+            return self.apply('or', self.negate(a), b)
+        if node.op == 'eq':
+            return self.negate(self.apply('xor', a, b))
+        return self.apply(node.op, a, b)
+
+    def count(self, u):
+        """Число наборов всех переменных, на которых u истинна."""
+        n = len(self.variables)
+        memo = {FALSE: 0, TRUE: 1}
+
+        def below(u):
+            # Наборы переменных с уровня var[u] и ниже.
+            if u not in memo:
+                level = self.var[u]
+                lo, hi = self.low[u], self.high[u]
+                memo[u] = (below(lo) << (self.var[lo] - level - 1)) + \
+                          (below(hi) << (self.var[hi] - level - 1))
+            return memo[u]
+
+        return below(u) << self.var[u] if u != FALSE else 0
+
+    def sample(self, u):
+        """Один выполняющий набор {имя: 0/1} или None. Переменные, от
+        которых ответ не зависит, равны 0."""
+        if u == FALSE:
+            return None
+        assignment = dict.fromkeys(self.variables, 0)
+        while u != TRUE:
+            name = self.variables[self.var[u]]
+            if self.low[u] != FALSE:
+                u = self.low[u]
+            else:
+                assignment[name] = 1
+                u = self.high[u]
+        return assignment
+
+    def size(self, u):
+        """Число внутренних узлов, достижимых из u."""
+        seen = set()
+        stack = [u]
+        while stack:
+            u = stack.pop()
+            if u > TRUE and u not in seen:
+                seen.add(u)
+                stack += (self.low[u], self.high[u])
+        return len(seen)
+
+
+def appearance_order(node, variables):
+    """Порядок первого появления при обходе дерева слева направо: связанные
+    друг с другом переменные оказываются рядом."""
+    order = []
+
+    def visit(node):
+        if node.op == 'var':
+            if node.value not in order:
+                order.append(node.value)
+        for arg in node.args:
+            visit(arg)
+
+    visit(node)
+    return order + [name for name in variables if name not in order]
+
+
+def frequency_order(node, variables):
+    """Сначала переменные, которые встречаются чаще."""
+    counts = Counter()
+
+    def visit(node):
+        if node.op == 'var':
+            counts[node.value] += 1
+        for arg in node.args:
+            visit(arg)
+
+    visit(node)
+    return sorted(variables, key=lambda name: -counts[name])
+
+
+ORDERINGS = {
+    'given': lambda node, variables: list(variables),
+    'appearance': appearance_order,
+    'frequency': frequency_order,
+}
+
+
+class Diagram:
+    """Выражение в виде ROBDD над выбранным порядком переменных."""
+
+    def __init__(self, bdd, root, variables):
+        self.bdd = bdd
+        self.root = root
+        self.variables = list(variables)
+
+    def count(self):
+        return self.bdd.count(self.root)
+
+    def sample(self):
+        assignment = self.bdd.sample(self.root)
+        return None if assignment is None else [assignment[name] for name in self.variables]
+
+    def sample_row(self):
+        """Номер строки таблицы с примером или None."""
+        bits = self.sample()
+        return None if bits is None else int(''.join(map(str, bits)) or '0', 2)
+
+    def size(self):
+        return self.bdd.size(self.root)
+
+    def with_expression(self, node):
+        """Другое выражение над тем же менеджером и порядком."""
+        check_variables(node, self.variables)
+        return Diagram(self.bdd, self.bdd.build(node), self.variables)
+
+    def difference(self, node):
+        """Набор, на котором выражение node отличается от этого, или None,
+        если они равносильны."""
+        other = self.with_expression(node)
+        if other.root == self.root:
+            return None
+        return Diagram(self.bdd, self.bdd.apply('xor', self.root, other.root), self.variables).sample()
+
+
+def diagram(node, variables, ordering='auto', limit=1_000_000, stop=None, progress=None):
+    """ROBDD для дерева node. ordering - имя из ORDERINGS или 'auto': тогда
+    пробуются все порядки, и каждая следующая попытка обрывается, как
+    только перерастёт лучшую. Если stop выставлен, построение бросает
+    Cancelled; progress получает число узлов текущей попытки."""
+    variables = list(variables)
+    check_variables(node, variables)
+    names = list(ORDERINGS) if ordering == 'auto' else [ordering]
+    best = None
+    for name in names:
+        bdd = BDD(ORDERINGS[name](node, variables), stop, progress)
+        bdd.limit = limit if best is None else min(limit, len(best.bdd))
+        try:
+            root = bdd.build(node)
+        except OverflowError:
+            continue
+        if best is None or len(bdd) < len(best.bdd):
+            best = Diagram(bdd, root, variables)
+    if best is None:
+        raise OverflowError("Диаграмма больше допустимого размера при всех порядках")
+    # Дальше диаграмма используется для запросов, уже вне построения.
+    best.bdd.limit = limit
+    best.bdd.stop = best.bdd.progress = None
+    return best
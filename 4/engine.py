@@ -0,0 +1,262 @@
+"""Таблица истинности на NumPy.
+
+Строка i таблицы - это двоичная запись i: первая переменная - старший
+бит, как в itertools.product([0, 1], repeat=n). Выражение вычисляется
+сразу над целыми столбцами значений.
+
+Таблица режется на куски по старшим битам: в куске из 2^CHUNK_BITS
+строк младшие переменные дают одни и те же столбцы, а старшие
+постоянны. Поэтому столбцы младших переменных строятся один раз, а
+старшие подставляются скалярами. Результат хранится упакованным по
+биту на строку, так что 26 переменных занимают 8 МБ.
+
+table_chunks отдаёт куски по мере готовности, и таблицу можно заполнять
+постепенно: строки до ready уже посчитаны.
+
+ColumnCache считает упакованный столбец для каждого подвыражения. Узлы
+с одинаковым строением получают один номер (hash-consing), так что
+повторяющееся поддерево считается один раз, а после правки выражения
+пересчитываются только изменившиеся поддеревья.
+"""
+import numpy as np
+
+from logic import check_variables
+
+CHUNK_BITS = 20
+# Строк в блоке при подсчёте для фильтра.
+BLOCK_BITS = 12
+
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+OPS = {
+    'not': lambda a: ~a,
+    'and': lambda a, b: a & b,
+    'or': lambda a, b: a | b,
+    'xor': lambda a, b: a ^ b,
+    'imp': lambda a, b: ~a | b,
+    'eq': lambda a, b: ~(a ^ b),
+}
+
+
+def evaluate(node, values):
+    """Значение дерева над столбцами: values - имя -> массив bool или
+    скаляр np.bool_."""
+    if node.op == 'var':
+        return values[node.value]
+    if node.op == 'const':
+        return np.bool_(node.value)
+    return OPS[node.op](*(evaluate(arg, values) for arg in node.args))
+
+
+def low_columns(n, low):
+    """Столбцы младших low переменных из n для куска в 2^low строк."""
+    index = np.arange(1 << low, dtype=np.uint32)
+    return [((index >> (low - 1 - k)) & 1).astype(bool) for k in range(low)]
+
+
+class TruthTable:
+    """Результаты всех 2^n строк, по биту на строку."""
+
+    def __init__(self, variables, packed, ready=None, subexpressions=()):
+        self.variables = list(variables)
+        self.packed = packed
+        self.ready = len(self) if ready is None else ready
+        # Пары (заголовок, упакованный столбец) промежуточных подвыражений.
+        self.subexpressions = list(subexpressions)
+
+    @classmethod
+    def empty(cls, variables):
+        """Таблица без посчитанных строк; заполняется через store."""
+        return cls(variables, np.zeros(((1 << len(variables)) + 7) >> 3, dtype=np.uint8), 0)
+
+    def store(self, start, packed):
+        """Кусок из table_chunks. Куски приходят по порядку."""
+        self.packed[start >> 3:(start >> 3) + len(packed)] = packed
+        self.ready = min(len(self), start + len(packed) * 8)
+
+    @property
+    def complete(self):
+        return self.ready == len(self)
+
+    def __len__(self):
+        return 1 << len(self.variables)
+
+    def __getitem__(self, i):
+        return int(self.packed[i >> 3] >> (7 - (i & 7))) & 1
+
+    @property
+    def headers(self):
+        return self.variables + [title for title, _ in self.subexpressions] + ['Результат']
+
+    def row(self, i):
+        """Значения переменных, подвыражений и результат строки i."""
+        n = len(self.variables)
+        return ([(i >> (n - 1 - k)) & 1 for k in range(n)]
+                + [int(packed[i >> 3] >> (7 - (i & 7))) & 1 for _, packed in self.subexpressions]
+                + [self[i]])
+
+    def results(self, start=0, stop=None):
+        """Результаты строк [start, stop) массивом bool."""
+        stop = len(self) if stop is None else stop
+        offset = start & 7
+        bits = np.unpackbits(self.packed[start >> 3:(stop + 7) >> 3])
+        return bits[offset:offset + stop - start].astype(bool)
+
+    def count(self):
+        """Число строк с результатом 1 среди посчитанных."""
+        return int(POPCOUNT[self.packed].sum(dtype=np.int64))
+
+    def select(self, value):
+        return Selection(self, value)
+
+
+class Selection:
+    """Номера строк с результатом value как последовательность.
+
+    Полный список номеров не строится: хранятся только накопленные
+    счётчики по блокам в 2^BLOCK_BITS строк, а k-я строка ищется
+    двоичным поиском по блокам и распаковкой одного блока. Учитываются
+    только строки, посчитанные к моменту создания.
+    """
+
+    def __init__(self, table, value):
+        self.table = table
+        self.value = int(value)
+        self.size = size = table.ready
+        packed = table.packed[:(size + 7) >> 3]
+        self.block = max(8, min(len(table), 1 << BLOCK_BITS))
+        blocks = -(-len(packed) // (self.block >> 3))
+        ones = np.zeros(blocks * (self.block >> 3), dtype=np.int64)
+        ones[:len(packed)] = POPCOUNT[packed]
+        ones = ones.reshape(blocks, -1).sum(axis=1)
+        if self.value:
+            counts = ones
+        else:
+            starts = np.arange(blocks, dtype=np.int64) * self.block
+            counts = np.minimum(self.block, size - starts) - ones
+        self.cumulative = np.cumsum(counts)
+
+    def __len__(self):
+        return int(self.cumulative[-1]) if len(self.cumulative) else 0
+
+    def _bits(self, b):
+        start = b * self.block
+        return self.table.results(start, min(start + self.block, self.size))
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        b = int(np.searchsorted(self.cumulative, k, side='right'))
+        before = int(self.cumulative[b - 1]) if b else 0
+        hits = np.flatnonzero(self._bits(b) == self.value)
+        return b * self.block + int(hits[k - before])
+
+    def position(self, row):
+        """Номер в выборке первой выбранной строки не раньше row."""
+        b = row // self.block
+        if b >= len(self.cumulative):
+            return len(self)
+        before = int(self.cumulative[b - 1]) if b else 0
+        bits = self._bits(b)[:row - b * self.block]
+        return before + int((bits == self.value).sum())
+
+
+def table_chunks(node, variables, chunk_bits=CHUNK_BITS):
+    """Куски таблицы для разобранного выражения node по порядку: пары
+    (номер первой строки, упакованные результаты)."""
+    variables = list(variables)
+    check_variables(node, variables)
+    n = len(variables)
+    # Кусок не меньше байта, иначе packbits дополнит его нулями.
+    low = min(n, max(chunk_bits, 3))
+    high = n - low
+    values = dict(zip(variables[high:], low_columns(n, low)))
+    for chunk in range(1 << high):
+        for k in range(high):
+            values[variables[k]] = np.bool_((chunk >> (high - 1 - k)) & 1)
+        result = evaluate(node, values)
+        # Выражение без младших переменных даёт скаляр.
+        yield chunk << low, np.packbits(np.broadcast_to(result, (1 << low,)))
+
+
+def truth_table(node, variables, chunk_bits=CHUNK_BITS):
+    """Таблица для разобранного выражения node."""
+    table = TruthTable.empty(variables)
+    for start, packed in table_chunks(node, variables, chunk_bits):
+        table.store(start, packed)
+    return table
+
+
+class ColumnCache:
+    """Упакованные столбцы подвыражений над одним списком переменных."""
+
+    def __init__(self, variables):
+        self.variables = list(variables)
+        self.rows = 1 << len(self.variables)
+        self.ids = {}
+        self.columns = {}
+        self.computed = 0
+
+    def intern(self, node):
+        """Номер узла: одинаковые по строению поддеревья получают один."""
+        key = (node.op, node.value, tuple(self.intern(arg) for arg in node.args))
+        return self.ids.setdefault(key, len(self.ids))
+
+    def _trim(self, packed):
+        # Хвост последнего байта после ~ не должен считаться строками.
+        if self.rows & 7:
+            packed[-1] &= (0xFF << (8 - (self.rows & 7))) & 0xFF
+        return packed
+
+    def column(self, node):
+        key = self.intern(node)
+        packed = self.columns.get(key)
+        if packed is None:
+            if node.op == 'var':
+                k = self.variables.index(node.value)
+                index = np.arange(self.rows, dtype=np.uint32)
+                packed = np.packbits(((index >> (len(self.variables) - 1 - k)) & 1).astype(bool))
+            elif node.op == 'const':
+                packed = self._trim(np.full((self.rows + 7) >> 3, 0xFF if node.value else 0, dtype=np.uint8))
+            else:
+                packed = self._trim(OPS[node.op](*(self.column(arg) for arg in node.args)))
+            self.columns[key] = packed
+            self.computed += 1
+        return packed
+
+    def subexpressions(self, node):
+        """Различные составные подвыражения node, кроме него самого, в
+        порядке вычисления: сначала части, потом целое."""
+        seen = {self.intern(node)}
+        order = []
+
+        def visit(node):
+            for arg in node.args:
+                visit(arg)
+                key = self.intern(arg)
+                if arg.args and key not in seen:
+                    seen.add(key)
+                    order.append(arg)
+
+        visit(node)
+        return order
+
+    def table(self, node):
+        """Таблица со столбцами подвыражений. Столбцы, которые node не
+        использует, из кэша удаляются."""
+        check_variables(node, self.variables)
+        self.computed = 0
+        packed = self.column(node)
+        used = set()
+
+        def mark(node):
+            used.add(self.intern(node))
+            for arg in node.args:
+                mark(arg)
+
+        mark(node)
+        self.columns = {key: column for key, column in self.columns.items() if key in used}
+        subexpressions = [(repr(sub), self.column(sub)) for sub in self.subexpressions(node)]
+        return TruthTable(self.variables, packed, subexpressions=subexpressions)
@@ -0,0 +1,141 @@
+"""Подбор переменных к столбцам фрагмента таблицы истинности.
+
+Фрагмент - несколько строк с пропусками: в каждой значения столбцов
+(0, 1 или пусто) и значение функции. Нужно узнать, какая переменная
+стоит в каком столбце.
+
+Множества строк полной таблицы хранятся битовыми масками в int: бит i
+отвечает строке i. Для каждой строки фрагмента держится маска строк
+таблицы, с которыми она ещё может совпасть. Поиск с возвратом назначает
+столбцы по одному, сначала тот, у которого меньше всего подходящих
+переменных; назначение сужает маски строк фрагмента, и пустая маска
+сразу обрывает ветку.
+"""
+import numpy as np
+
+BLANKS = {'.', '_', '?', '-', '*'}
+
+
+def parse_fragment(text):
+    """Строки вида "1 . 0 1 | 1" или "1 . 0 1 1": последнее значение -
+    функция, пропуск - точка, подчёркивание или знак вопроса."""
+    rows = []
+    for line in text.splitlines():
+        tokens = line.replace('|', ' ').split()
+        if not tokens:
+            continue
+        cells = []
+        for token in tokens:
+            if token in BLANKS:
+                cells.append(None)
+            elif token in ('0', '1'):
+                cells.append(int(token))
+            else:
+                raise ValueError(f"Непонятное значение во фрагменте: {token}")
+        if len(cells) < 2:
+            raise ValueError("В строке фрагмента нужны столбцы и значение функции")
+        rows.append((tuple(cells[:-1]), cells[-1]))
+    if not rows:
+        raise ValueError("Фрагмент пуст")
+    if len({len(cells) for cells, _ in rows}) != 1:
+        raise ValueError("В строках фрагмента разное число столбцов")
+    return rows
+
+
+def _bitset(flags):
+    return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _distinct(candidates):
+    """Можно ли выбрать строкам фрагмента разные строки таблицы
+    (паросочетание увеличивающими путями)."""
+    owner = {}
+
+    def place(k, seen):
+        for i in _bits(candidates[k]):
+            if i not in seen:
+                seen.add(i)
+                if i not in owner or place(owner[i], seen):
+                    owner[i] = k
+                    return True
+        return False
+
+    return all(place(k, set()) for k in range(len(candidates)))
+
+
+class FragmentMatcher:
+    """results - значения функции по строкам таблицы (массив 0/1 длины
+    2^n), variables - имена в порядке старших битов номера строки."""
+
+    def __init__(self, variables, results):
+        self.variables = list(variables)
+        n = len(self.variables)
+        results = np.asarray(results, dtype=bool)
+        index = np.arange(1 << n)
+        self.by_result = {0: _bitset(~results), 1: _bitset(results), None: (1 << (1 << n)) - 1}
+        self.by_value = []
+        for k in range(n):
+            column = ((index >> (n - 1 - k)) & 1).astype(bool)
+            self.by_value.append({0: _bitset(~column), 1: _bitset(column)})
+
+    @classmethod
+    def from_table(cls, table):
+        return cls(table.variables, table.results())
+
+    def solve(self, fragment, distinct=True):
+        """Все назначения столбец -> переменная: список кортежей имён по
+        столбцам. distinct требует, чтобы строки фрагмента были разными
+        строками таблицы."""
+        columns = len(fragment[0][0])
+        if columns != len(self.variables):
+            raise ValueError(f"Во фрагменте {columns} столбцов, а переменных {len(self.variables)}")
+        masks = [self.by_result[result] for _, result in fragment]
+        # По столбцам: (строка фрагмента, значение) для заполненных клеток.
+        filled = [[(k, cells[c]) for k, (cells, _) in enumerate(fragment) if cells[c] is not None]
+                  for c in range(columns)]
+        solutions = []
+        assignment = [None] * columns
+
+        def narrowed(masks, c, v):
+            by_value = self.by_value[v]
+            masks = list(masks)
+            for k, value in filled[c]:
+                masks[k] &= by_value[value]
+                if not masks[k]:
+                    return None
+            return masks
+
+        def search(masks, free):
+            if not any(m is None for m in assignment):
+                if not distinct or _distinct(masks):
+                    solutions.append(tuple(self.variables[v] for v in assignment))
+                return
+            # Столбец с наименьшим числом подходящих переменных.
+            best = None
+            for c in range(columns):
+                if assignment[c] is not None:
+                    continue
+                options = []
+                for v in free:
+                    result = narrowed(masks, c, v)
+                    if result is not None:
+                        options.append((v, result))
+                if not options:
+                    return
+                if best is None or len(options) < len(best[1]):
+                    best = (c, options)
+            c, options = best
+            for v, result in options:
+                assignment[c] = v
+                search(result, free - {v})
+            assignment[c] = None
+
+        search(masks, frozenset(range(len(self.variables))))
+        return solutions
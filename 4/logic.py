@@ -0,0 +1,135 @@
+"""Разбор логических выражений.
+
+Понимаются обозначения ¬ ∧ ∨ → ↔ ⊕, русские слова НЕ, И, ИЛИ и
+питоновские not, and, or, а также 0/1 и скобки. Приоритет от высшего к
+низшему: НЕ, И, ИЛИ, ⊕, →, ↔. Импликация правоассоциативна.
+
+Выражение разбирается один раз в дерево; по нему считают таблицу
+(engine), диаграмму решений (bdd) и столбцы подвыражений.
+"""
+import re
+
+KEYWORDS = {
+    'не': 'not', 'not': 'not', '¬': 'not', '!': 'not', '~': 'not',
+    'и': 'and', 'and': 'and', '∧': 'and', '&': 'and',
+    'или': 'or', 'or': 'or', '∨': 'or', '|': 'or',
+    '⊕': 'xor', 'xor': 'xor', '^': 'xor',
+    '→': 'imp', '->': 'imp', '=>': 'imp', '<=': 'imp',
+    '↔': 'eq', '<->': 'eq', '<=>': 'eq', '==': 'eq',
+    '!=': 'xor',
+}
+
+TOKEN = re.compile(r"\s*(?:(<->|<=>|->|=>|<=|==|!=)|([()¬∧∨→↔⊕!~&|^])|(\w+))")
+
+# Двуместные операции по возрастанию приоритета.
+LEVELS = ['eq', 'imp', 'xor', 'or', 'and']
+
+
+class Node:
+    """Узел дерева: op - 'var', 'const', 'not' или двуместная операция."""
+
+    __slots__ = ('op', 'args', 'value')
+
+    def __init__(self, op, *args, value=None):
+        self.op = op
+        self.args = args
+        self.value = value
+
+    def __repr__(self):
+        if self.op in ('var', 'const'):
+            return str(self.value)
+        if self.op == 'not':
+            return f"¬{self.args[0]!r}"
+        symbol = {'and': '∧', 'or': '∨', 'xor': '⊕', 'imp': '→', 'eq': '↔'}[self.op]
+        return f"({self.args[0]!r} {symbol} {self.args[1]!r})"
+
+    def variables(self):
+        if self.op == 'var':
+            return {self.value}
+        return set().union(*(arg.variables() for arg in self.args))
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if not match:
+            while text[pos].isspace():
+                pos += 1
+            raise SyntaxError(f"Непонятный символ в позиции {pos + 1}: {text[pos]!r}")
+        pos = match.end()
+        word = match.group(match.lastindex)
+        key = word.lower()
+        if key in KEYWORDS:
+            tokens.append(KEYWORDS[key])
+        elif word in '()':
+            tokens.append(word)
+        elif word in ('0', '1'):
+            tokens.append(('const', int(word)))
+        elif word[0].isdigit():
+            raise SyntaxError(f"Неверное имя переменной: {word}")
+        else:
+            tokens.append(('var', word))
+    return tokens
+
+
+class Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.binary(0)
+        if self.peek() is not None:
+            raise SyntaxError(f"Лишний фрагмент выражения: {self.peek()}")
+        return node
+
+    def binary(self, level):
+        if level == len(LEVELS):
+            return self.unary()
+        op = LEVELS[level]
+        left = self.binary(level + 1)
+        if op == 'imp':
+            if self.peek() == op:
+                self.take()
+                return Node(op, left, self.binary(level))
+            return left
+        while self.peek() == op:
+            self.take()
+            left = Node(op, left, self.binary(level + 1))
+        return left
+
+    def unary(self):
+        token = self.take()
+        if token == 'not':
+            return Node('not', self.unary())
+        if token == '(':
+            node = self.binary(0)
+            if self.take() != ')':
+                raise SyntaxError("Не хватает закрывающей скобки")
+            return node
+        if isinstance(token, tuple):
+            return Node(token[0], value=token[1])
+        raise SyntaxError("Ожидалась переменная или скобка" if token is None
+                          else f"Неожиданный символ: {token}")
+
+
+def parse(text):
+    return Parser(tokenize(text)).parse()
+
+
+def check_variables(node, variables):
+    """NameError, если в node есть переменные не из variables."""
+    missing = node.variables() - set(variables)
+    if missing:
+        raise NameError(f"Неизвестные переменные: {', '.join(sorted(missing))}")
@@ -1,22 +1,34 @@
-import itertools
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from bdd import Cancelled, diagram
+from engine import ColumnCache, TruthTable, table_chunks
+from fragment import FragmentMatcher, parse_fragment
+from logic import check_variables, parse
+from view import VirtualTable
+
+# Больше строк таблица не показывает; ответы даёт только BDD.
+MAX_TABLE_VARIABLES = 26
+# Столбцы подвыражений считаются целиком, поэтому только для небольших таблиц.
+MAX_SUBEXPRESSION_VARIABLES = 20
+# Как часто главный поток забирает готовые куски у рабочего.
+POLL_MS = 100
+
 
 class LogicTableApp:
     def __init__(self, root):
-        self.replacements = {
-            ' И ': ' and ',
-            ' ИЛИ ': ' or ',
-            ' НЕ ': ' not ',
-            '¬': 'not ',
-            '∧': ' and ',
-            '∨': ' or ',
-            '→': ' <= ',
-            '↔': ' == ',
-            '⊕': ' != ',
-        }
         self.root = root
+        self.table = None
+        self.diagram = None
+        self.diagram_nodes = None
+        self.variables = []
+        self.column_cache = None
+        self.messages = None
+        self.cancelled = None
+        self.started = 0
         self.root.title("Таблиц истинности")
         self.root.geometry("800x600")
 
@@ -33,33 +45,64 @@ class LogicTableApp:
         self.vars_entry.grid(row=1, column=1, pady=5, padx=5)
         self.vars_entry.insert(0, "A, B, C")
 
-        ttk.Button(input_frame, text="Построить таблицу истинности",
-                   command=self.build_table).grid(row=2, column=0, columnspan=2, pady=10)
+        build_buttons = ttk.Frame(input_frame)
+        build_buttons.grid(row=2, column=0, columnspan=2, pady=10)
+        ttk.Button(build_buttons, text="Построить таблицу истинности",
+                   command=self.build_table).pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(build_buttons, text="Отмена",
+                                        command=self.cancel, state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        self.subexpressions_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(build_buttons, text="столбцы подвыражений",
+                        variable=self.subexpressions_var).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(input_frame, text="Сравнить с выражением:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.other_entry = ttk.Entry(input_frame, width=50)
+        self.other_entry.grid(row=3, column=1, pady=5, padx=5)
+        ttk.Button(input_frame, text="Проверить равносильность",
+                   command=self.check_equivalence).grid(row=3, column=2, pady=5)
 
-        table_frame = ttk.Frame(root, padding="10")
-        table_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        view_frame = ttk.Frame(input_frame)
+        view_frame.grid(row=4, column=0, columnspan=2, sticky=tk.W)
 
-        self.tree = ttk.Treeview(table_frame, height=15)
-        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.filter_var = tk.StringVar(value='all')
+        ttk.Label(view_frame, text="Показывать:").pack(side=tk.LEFT)
+        for text, value in (("все", 'all'), ("результат = 1", '1'), ("результат = 0", '0')):
+            ttk.Radiobutton(view_frame, text=text, value=value, variable=self.filter_var,
+                            command=self.apply_filter).pack(side=tk.LEFT, padx=3)
 
-        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        vsb.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.tree.configure(yscrollcommand=vsb.set)
+        ttk.Label(view_frame, text="Строка №").pack(side=tk.LEFT, padx=(15, 3))
+        self.row_entry = ttk.Entry(view_frame, width=12)
+        self.row_entry.pack(side=tk.LEFT)
+        self.row_entry.bind('<Return>', lambda event: self.jump_to_row())
+        ttk.Button(view_frame, text="Перейти", command=self.jump_to_row).pack(side=tk.LEFT, padx=3)
 
-        hsb = ttk.Scrollbar(table_frame, orient="horizontal", command=self.tree.xview)
-        hsb.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        self.tree.configure(xscrollcommand=hsb.set)
+        ttk.Label(input_frame, text="Фрагмент таблицы\n(пропуск - точка,\nпоследнее - значение):").grid(
+            row=5, column=0, sticky=tk.W, pady=5)
+        self.fragment_text = tk.Text(input_frame, width=38, height=4)
+        self.fragment_text.grid(row=5, column=1, pady=5, padx=5, sticky=tk.W)
+        self.fragment_text.insert('1.0', "1 . 0 | 1\n. 1 . | 0")
+        fragment_buttons = ttk.Frame(input_frame)
+        fragment_buttons.grid(row=5, column=2, pady=5)
+        self.distinct_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(fragment_buttons, text="строки различны",
+                        variable=self.distinct_var).pack(anchor=tk.W)
+        ttk.Button(fragment_buttons, text="Подобрать переменные",
+                   command=self.match_fragment).pack(pady=3)
+
+        self.view = VirtualTable(root, padding="10")
+        self.view.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         result_frame = ttk.Frame(root, padding="10")
         result_frame.grid(row=2, column=0, sticky=(tk.W, tk.E))
 
+        self.progress = ttk.Progressbar(result_frame, length=200, maximum=100)
+        self.progress.grid(row=0, column=0, padx=5)
         self.result_label = ttk.Label(result_frame, text="", font=("Arial", 10))
-        self.result_label.grid(row=0, column=0)
+        self.result_label.grid(row=0, column=1)
 
         root.columnconfigure(0, weight=1)
         root.rowconfigure(1, weight=1)
-        table_frame.columnconfigure(0, weight=1)
-        table_frame.rowconfigure(0, weight=1)
 
     def build_table(self):
         try:
@@ -71,50 +114,214 @@ class LogicTableApp:
                 return
 
             variables = [v.strip() for v in vars_str.split(',')]
-            py_expression = self.convert_to_python(expression)
-            self.tree.delete(*self.tree.get_children())
-
-            columns = variables + ['Результат']
-            self.tree['columns'] = columns
-            self.tree.heading('#0', text='№')
-            self.tree.column('#0', width=40)
-
-            for col in columns:
-                self.tree.heading(col, text=col)
-                self.tree.column(col, width=80, anchor='center')
-
-            row_num = 1
-
-            for values in itertools.product([0, 1], repeat=len(variables)):
-                var_dict = dict(zip(variables, values))
-                py_expression_new = py_expression
-                for key, value in var_dict.items():
-                    py_expression_new = py_expression_new.replace(key, str(value))
-                try:
-                    result = int(bool(eval(py_expression_new)))
-                except Exception as e:
-                    messagebox.showerror("Ошибка", "Ошибка в логическом выражении")
-                    return
-
-                row_values = list(values) + [result]
-                self.tree.insert('', 'end', text=str(row_num), values=row_values)
-                row_num += 1
+            try:
+                node = parse(expression)
+                check_variables(node, variables)
+            except (SyntaxError, NameError) as e:
+                messagebox.showerror("Ошибка", f"Ошибка в логическом выражении: {e}")
+                return
+
+            self.cancel()
+            self.diagram = None
+            self.diagram_nodes = None
+            self.variables = variables
+            # Строки перебираются только для показа.
+            with_table = False
+            if self.subexpressions_var.get() and len(variables) <= MAX_SUBEXPRESSION_VARIABLES:
+                # Кэш живёт между построениями: после правки выражения
+                # пересчитываются только изменённые поддеревья.
+                if self.column_cache is None or self.column_cache.variables != variables:
+                    self.column_cache = ColumnCache(variables)
+                self.table = self.column_cache.table(node)
+                self.view.set_table(self.table, self.filter_value())
+            elif len(variables) <= MAX_TABLE_VARIABLES:
+                self.table = TruthTable.empty(variables)
+                self.view.set_table(self.table, self.filter_value())
+                with_table = True
+            else:
+                self.table = None
+                self.view.clear()
+
+            self.messages = queue.Queue()
+            self.cancelled = threading.Event()
+            self.started = time.perf_counter()
+            threading.Thread(target=self.compute, daemon=True,
+                             args=(node, variables, with_table,
+                                   self.messages, self.cancelled)).start()
+            self.progress['value'] = 0
+            self.cancel_button.state(['!disabled'])
+            self.root.after(POLL_MS, self.poll, self.messages)
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Произошла ошибка: {str(e)}")
 
-    def convert_to_python(self, expression):
+    @staticmethod
+    def compute(node, variables, with_table, messages, cancelled):
+        """Рабочий поток: к Tk и к таблице не обращается, только кладёт
+        сообщения в очередь."""
+        try:
+            if with_table:
+                for start, packed in table_chunks(node, variables):
+                    if cancelled.is_set():
+                        messages.put(('cancelled',))
+                        return
+                    messages.put(('rows', start, packed))
+            if cancelled.is_set():
+                messages.put(('cancelled',))
+                return
+            messages.put(('nodes', 0))
+            try:
+                result = diagram(node, variables, stop=cancelled,
+                                 progress=lambda count: messages.put(('nodes', count)))
+            except OverflowError:
+                result = None
+            except Cancelled:
+                messages.put(('cancelled',))
+                return
+            messages.put(('diagram', result))
+            messages.put(('done',))
+        except Exception as e:
+            messages.put(('error', e))
+
+    def poll(self, messages):
+        if messages is not self.messages:
+            return  # сообщения от уже отменённого построения
+        finished = None
+        new_rows = False
+        try:
+            while finished is None:
+                message = messages.get_nowait()
+                if message[0] == 'rows':
+                    self.table.store(message[1], message[2])
+                    new_rows = True
+                elif message[0] == 'nodes':
+                    self.diagram_nodes = message[1]
+                elif message[0] == 'diagram':
+                    self.diagram = message[1]
+                else:
+                    finished = message
+        except queue.Empty:
+            pass
+
+        if new_rows:
+            self.view.reload()
+        if finished is None:
+            self.show_progress()
+            self.root.after(POLL_MS, self.poll, messages)
+            return
+
+        self.messages = None
+        self.cancel_button.state(['disabled'])
+        if finished[0] == 'error':
+            self.result_label.config(text="")
+            messagebox.showerror("Ошибка", f"Произошла ошибка: {finished[1]}")
+        elif finished[0] == 'cancelled':
+            self.show_progress("Остановлено: ")
+        else:
+            self.progress['value'] = 100
+            self.show_result()
+
+    def show_progress(self, prefix=""):
+        rows = ""
+        if self.table is not None:
+            ready, total = self.table.ready, len(self.table)
+            rate = ready / max(time.perf_counter() - self.started, 1e-9)
+            self.progress['value'] = 100 * ready / total
+            rows = (f"посчитано {ready} из {total} строк ({rate:.0f} строк/с), "
+                    f"истинно {self.table.count()}")
+        if self.diagram_nodes is not None:
+            # Размер диаграммы заранее неизвестен: полоса только движется.
+            self.progress['value'] = (self.progress['value'] + 5) % 100
+            nodes = f"{'' if prefix else 'строится '}диаграмма решений: {self.diagram_nodes} узлов"
+            rows = f"{rows}; {nodes}" if rows else nodes
+        self.result_label.config(text=prefix + rows)
+
+    def show_result(self):
+        note = ""
+        if self.table is None:
+            note = f" (таблица показывается не больше чем для {MAX_TABLE_VARIABLES} переменных)"
+        elif self.table.subexpressions:
+            note = f", пересчитано столбцов: {self.column_cache.computed}"
+        if self.diagram is None:
+            # Диаграмма не уместилась - остаётся подсчёт по таблице.
+            count = self.table.count() if self.table is not None else "?"
+            self.result_label.config(text=f"Истинно в {count} из {2 ** len(self.variables)} строк{note}")
+            return
+        sample = self.diagram.sample()
+        example = "нет" if sample is None else self.format_assignment(sample)
+        self.result_label.config(
+            text=f"Истинно в {self.diagram.count()} из {2 ** len(self.diagram.variables)} строк, "
+                 f"пример: {example}{note}")
+
+    def cancel(self):
+        if self.cancelled is not None:
+            self.cancelled.set()
 
-        result = expression
-        for old, new in self.replacements.items():
-            result = expression.replace(old, new)
+    def format_assignment(self, bits):
+        return ", ".join(f"{name}={bit}" for name, bit in zip(self.diagram.variables, bits))
 
-        if '<=' in expression and 'not' not in result:
-            parts = result.split('<=')
-            if len(parts) == 2:
-                result = f"(not ({parts[0].strip()}) or ({parts[1].strip()}))"
+    def check_equivalence(self):
+        if self.diagram is None:
+            messagebox.showerror("Ошибка", "Сначала постройте таблицу и дождитесь окончания")
+            return
+        try:
+            difference = self.diagram.difference(parse(self.other_entry.get().strip()))
+        except (SyntaxError, NameError) as e:
+            messagebox.showerror("Ошибка", f"Ошибка в логическом выражении: {e}")
+            return
+        except OverflowError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        if difference is None:
+            messagebox.showinfo("Равносильность", "Выражения равносильны")
+            return
+        row = int(''.join(map(str, difference)), 2)
+        if self.table is not None:
+            self.filter_var.set('all')
+            self.apply_filter()
+            self.view.jump(row)
+        messagebox.showinfo("Равносильность",
+                            f"Выражения различаются в строке {row + 1}: "
+                            f"{self.format_assignment(difference)}")
+
+    def match_fragment(self):
+        if self.table is None or not self.table.complete:
+            messagebox.showerror("Ошибка", "Сначала постройте таблицу и дождитесь окончания")
+            return
+        try:
+            fragment = parse_fragment(self.fragment_text.get('1.0', 'end'))
+            solutions = FragmentMatcher.from_table(self.table).solve(fragment, self.distinct_var.get())
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        if not solutions:
+            messagebox.showinfo("Подбор", "Подходящих расстановок переменных нет")
+            return
+        lines = [" ".join(solution) for solution in solutions[:20]]
+        if len(solutions) > 20:
+            lines.append(f"... всего {len(solutions)}")
+        messagebox.showinfo("Подбор", "Переменные по столбцам:\n" + "\n".join(lines))
 
-        return result
+    def filter_value(self):
+        value = self.filter_var.get()
+        return None if value == 'all' else int(value)
+
+    def apply_filter(self):
+        self.view.set_filter(self.filter_value())
+
+    def jump_to_row(self):
+        if self.table is None:
+            return
+        try:
+            row = int(self.row_entry.get())
+        except ValueError:
+            messagebox.showerror("Ошибка", "Номер строки должен быть целым числом")
+            return
+        if not 1 <= row <= len(self.table):
+            messagebox.showerror("Ошибка", f"Номер строки от 1 до {len(self.table)}")
+            return
+        if self.view.jump(row - 1) is None:
+            messagebox.showinfo("Переход", "После этой строки подходящих строк нет")
 
 
 def main():
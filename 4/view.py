@@ -0,0 +1,136 @@
+"""Виртуальная таблица истинности для Tk.
+
+В Treeview всегда лежит ровно столько элементов, сколько строк видно.
+При прокрутке у них меняются только тексты: строка i берётся из
+TruthTable по номеру, ведь набор значений строки - это биты i. Полосу
+прокрутки ведём сами, по номеру первой видимой строки.
+
+Таблица может ещё считаться: у строк дальше table.ready вместо
+результата многоточие, а reload подхватывает новые строки, не сбивая
+прокрутку.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(ttk.Frame):
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.table = None
+        self.rows = range(0)
+        self.first = 0
+        self.visible = 15
+        self.marked = None
+        self.value = None
+
+        self.tree = ttk.Treeview(self, height=self.visible, selectmode='none')
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.tree.tag_configure('marked', background='#ffe08a')
+
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.vsb.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        hsb.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.tree.configure(xscrollcommand=hsb.set)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_wheel)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+    def set_table(self, table, value=None):
+        self.table = table
+        columns = table.headers
+        self.tree['columns'] = list(range(len(columns)))
+        self.tree.heading('#0', text='№')
+        self.tree.column('#0', width=80)
+        for k, title in enumerate(columns):
+            self.tree.heading(k, text=title)
+            self.tree.column(k, width=max(80, 8 * len(title)), anchor='center')
+        self.set_filter(value)
+
+    def clear(self):
+        self.table = None
+        self.rows = range(0)
+        self.first = 0
+        self.refresh()
+
+    def set_filter(self, value):
+        """value None - все строки, 0 или 1 - только строки с таким результатом."""
+        self.value = value
+        self.marked = None
+        self.first = 0
+        self.reload()
+
+    def reload(self):
+        """Перестроить выборку строк после того, как их посчитано больше."""
+        if self.table is None:
+            return
+        self.rows = range(len(self.table)) if self.value is None else self.table.select(self.value)
+        self.scroll_to(self.first)
+
+    def yview(self, *args):
+        """Протокол команды Scrollbar: moveto доля или scroll n units/pages."""
+        if args[0] == 'moveto':
+            first = int(float(args[1]) * len(self.rows))
+        else:
+            step = self.visible if args[2] == 'pages' else 1
+            first = self.first + int(args[1]) * step
+        self.scroll_to(first)
+
+    def scroll_to(self, first):
+        self.first = max(0, min(first, len(self.rows) - self.visible))
+        self.refresh()
+
+    def jump(self, row):
+        """Прокрутка к строке row (с нуля) или, при фильтре, к ближайшей
+        подходящей после неё. Возвращает номер показанной строки или None."""
+        position = row if isinstance(self.rows, range) else self.rows.position(row)
+        if position >= len(self.rows):
+            self.marked = None
+            self.scroll_to(len(self.rows))
+            return None
+        self.marked = self.rows[position]
+        self.scroll_to(position)
+        return self.marked
+
+    def refresh(self):
+        items = self.tree.get_children()
+        count = max(0, min(self.visible, len(self.rows) - self.first))
+        if len(items) > count:
+            self.tree.delete(*items[count:])
+        for k in range(count):
+            i = self.rows[self.first + k]
+            values = self.table.row(i)
+            if i >= self.table.ready:
+                values[-1] = '…'
+            options = {'text': str(i + 1), 'values': values,
+                       'tags': ('marked',) if i == self.marked else ()}
+            if k < len(items):
+                self.tree.item(items[k], **options)
+            else:
+                self.tree.insert('', 'end', **options)
+
+        total = len(self.rows)
+        if total:
+            self.vsb.set(self.first / total, (self.first + count) / total)
+        else:
+            self.vsb.set(0, 1)
+
+    def on_resize(self, event):
+        rowheight = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        # Одна строка уходит на заголовок.
+        visible = max(1, event.height // rowheight - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.first)
+
+    def on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first - 3)
+        else:
+            self.scroll_to(self.first + 3)
+        return 'break'
@@ -0,0 +1,107 @@
+"""Ретроградный анализ игры с одной кучей.
+
+Позиции - числа 0 .. target - 1; всё, что не меньше target, - конец
+игры: ходящий из такой позиции уже проиграл, ходов до конца 0. Ход,
+дающий отрицательное число, запрещён; позиция без разрешённых ходов
+тоже проигрышная с глубиной 0.
+
+Разметка идёт от конца игры к началу, в порядке обхода в ширину:
+позиция выигрышная, если есть ход в проигрышную, и проигрышная, когда
+проигрышными для соперника не оказался ни один из её ходов (у каждой
+позиции считается, сколько ходов ещё не размечено). Глубина - число
+ходов до конца при лучшей игре обоих: победитель спешит, проигравший
+тянет. Позиции, до которых разметка не дошла (циклы при убывающих
+ходах), - ничьи. Дальше любой вопрос о позиции - обращение к списку.
+"""
+from collections import deque
+
+WIN, LOSS, DRAW = 'win', 'loss', 'draw'
+
+
+class GameTable:
+    def __init__(self, target, moves):
+        self.target = target
+        self.moves = list(moves)
+        end = target  # одна общая вершина для всех позиций >= target
+        predecessors = [[] for _ in range(end + 1)]
+        left = [0] * end
+        for p in range(end):
+            successors = self.successors(p)
+            for q in successors:
+                predecessors[q].append(p)
+            left[p] = len(successors)
+
+        self.value = [DRAW] * (end + 1)
+        self.depth = [None] * (end + 1)
+        queue = deque([end])
+        self.value[end], self.depth[end] = LOSS, 0
+        for p in range(end):
+            if not left[p]:
+                self.value[p], self.depth[p] = LOSS, 0
+                queue.append(p)
+
+        while queue:
+            q = queue.popleft()
+            lost = self.value[q] == LOSS
+            for p in predecessors[q]:
+                if self.value[p] != DRAW:
+                    continue
+                if lost:
+                    self.value[p], self.depth[p] = WIN, self.depth[q] + 1
+                    queue.append(p)
+                else:
+                    left[p] -= 1
+                    # Обход в ширину: последний выигрыш соперника самый долгий.
+                    if not left[p]:
+                        self.value[p], self.depth[p] = LOSS, self.depth[q] + 1
+                        queue.append(p)
+
+    def successors(self, s):
+        """Различные позиции после одного хода; конец игры - target."""
+        result = set()
+        for move in self.moves:
+            q = move(s)
+            if q >= 0:
+                result.add(min(q, self.target))
+        return result
+
+    def status(self, s):
+        """(WIN, LOSS или DRAW, ходов до конца) для ходящего из s."""
+        s = min(s, self.target)
+        return self.value[s], self.depth[s]
+
+    def is_win(self, s, depth):
+        return self.status(s) == (WIN, depth)
+
+    def is_loss(self, s, depth):
+        return self.status(s) == (LOSS, depth)
+
+
+def task_19(table, start, end, after_mistake):
+    """Минимальное S из [start, end], при котором Ваня выигрывает своим
+    первым ходом. after_mistake - после неудачного хода Пети (есть ход
+    Пети, после которого Ваня выигрывает за ход), иначе - при любой
+    игре Пети (S проигрышная за два хода)."""
+    for s in range(start, min(end, table.target - 1) + 1):
+        if after_mistake:
+            if any(table.is_win(q, 1) for q in table.successors(s)):
+                return s
+        elif table.is_loss(s, 2):
+            return s
+    return None
+
+
+def task_20(table, start, end):
+    """Все S из [start, end], при которых Петя не может выиграть первым
+    ходом, но выигрывает вторым при любой игре Вани."""
+    return [s for s in range(start, min(end, table.target - 1) + 1) if table.is_win(s, 3)]
+
+
+def task_21(table, start, end):
+    """Минимальное S из [start, end], при котором Ваня выигрывает первым
+    или вторым ходом при любой игре Пети, но не может гарантировать
+    победу первым ходом."""
+    for s in range(start, min(end, table.target - 1) + 1):
+        if table.is_loss(s, 4):
+            return s
+    return None
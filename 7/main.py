@@ -4,6 +4,8 @@ from PyQt6 import QtWidgets
 from PyQt6 import uic
 from PyQt6.QtWidgets import QButtonGroup
 
+from game import GameTable, task_19, task_20, task_21
+
 
 def get_text_19(answer):
     return f"""============================================================
@@ -15,6 +17,29 @@ def get_text_19(answer):
 Ответ 19: {answer}"""
 
 
+def get_text_20(answer):
+    values = " ".join(map(str, answer)) if answer else None
+    return f"""============================================================
+ЗАДАЧА 20
+============================================================
+Найти значения S, при которых первый игрок не может
+выиграть первым ходом, но выигрывает вторым ходом
+при любой игре второго игрока.
+------------------------------------------------------------
+Ответ 20: {values}"""
+
+
+def get_text_21(answer):
+    return f"""============================================================
+ЗАДАЧА 21
+============================================================
+Найти минимальное S, при котором второй игрок выигрывает
+первым или вторым ходом при любой игре первого, но не
+может гарантированно выиграть первым ходом.
+------------------------------------------------------------
+Ответ 21: {answer}"""
+
+
 class MainWindow(QtWidgets.QMainWindow):
 
     def __init__(self, *args, **kwargs):
@@ -47,16 +72,6 @@ class MainWindow(QtWidgets.QMainWindow):
             return lambda s: s // value
         return None
 
-    def main_game(self, s, m, target, moves, use_any):
-        if s >= target: return m % 2 == 0
-        if m == 0: return False
-        h = []
-        for move in moves:
-            h.append(self.main_game(move(s), m - 1, target, moves, use_any))
-        if not use_any:
-            return any(h) if m % 2 else all(h)
-        return all(h) if m % 2 else any(h)
-
     def get_functions(self):
         functions = []
         for i, text in enumerate([self.lineEdit.text(), self.lineEdit_1.text(), self.lineEdit_2.text()]):
@@ -78,18 +93,25 @@ class MainWindow(QtWidgets.QMainWindow):
         if not functions:
             self.text_edit.setPlainText("No functions found")
             return
+
+        try:
+            table = GameTable(target_val, functions)
+        except ZeroDivisionError:
+            self.text_edit.setPlainText("ERROR IN INPUT FUNCTIONS")
+            return
         use_any = 0
 
         for j, button in enumerate(self.group.buttons()):
             if button.isChecked():
                 use_any = j
 
-        answer_19 = None
-        for s in range(start, end + 1):
-            if self.main_game(s, 2, target_val, functions, use_any):
-                answer_19 = s
-                break
-        self.text_edit.setPlainText(get_text_19(answer_19))
+        # Все три задачи - обращения к одной таблице значений позиций.
+        answer_19 = task_19(table, start, end, use_any)
+        answer_20 = task_20(table, start, end)
+        answer_21 = task_21(table, start, end)
+        self.text_edit.setPlainText("\n\n".join([get_text_19(answer_19),
+                                                 get_text_20(answer_20),
+                                                 get_text_21(answer_21)]))
 
 
 if __name__ == "__main__":